@@ -34,6 +34,10 @@ class Settings:
     KAKAO_REST_API_KEY: str = os.getenv("KAKAO_REST_API_KEY", "")
     KAKAO_ACCESS_TOKEN: str = os.getenv("KAKAO_ACCESS_TOKEN", "")
     KAKAO_REFRESH_TOKEN: str = os.getenv("KAKAO_REFRESH_TOKEN", "")
+    # 갱신된 토큰 캐시 파일 (재시작 시 refresh 호출 생략)
+    KAKAO_TOKEN_CACHE: Path = Path(
+        os.getenv("KAKAO_TOKEN_CACHE", str(BASE_DIR / ".kakao_token_cache.json"))
+    )
 
     # --- 텔레그램 알림 ---
     TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
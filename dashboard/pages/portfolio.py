@@ -44,8 +44,15 @@ SECTOR_COLORS = {
 # ── 캐시 함수 ──────────────────────────────────────────────────────────────
 
 @st.cache_data(ttl=CACHE_TTL_REALTIME)
+def _get_dashboard_snapshot():
+    return safe_call(
+        portfolio_manager.get_dashboard_snapshot,
+        default={"summary": {"holdings": []}, "sector_allocation": []},
+    )
+
+
 def _get_portfolio_data():
-    return safe_call(portfolio_manager.get_summary, default={"holdings": []})
+    return _get_dashboard_snapshot()["summary"]
 
 
 @st.cache_data(ttl=CACHE_TTL_REALTIME)
@@ -63,9 +70,8 @@ def _get_realized_pnl():
     return safe_call(portfolio_manager.get_realized_pnl_by_period, default={"monthly": [], "total_realized": 0.0})
 
 
-@st.cache_data(ttl=CACHE_TTL_MEDIUM)
 def _get_sector_allocation():
-    return safe_call(portfolio_manager.get_sector_allocation, default=[])
+    return _get_dashboard_snapshot()["sector_allocation"]
 
 
 @st.cache_data(ttl=CACHE_TTL_STATIC)
@@ -129,7 +135,7 @@ def render():
             display_cols = [
                 "ticker", "name", "quantity", "avg_buy_price",
                 "current_price", "current_value", "unrealized_pnl", "unrealized_pnl_pct",
-                "first_bought_at",
+                "first_bought_at", "stale",
             ]
             available = [c for c in display_cols if c in df.columns]
             display_df = df[available].copy()
@@ -138,6 +144,7 @@ def render():
                 "avg_buy_price": "평균매수가", "current_price": "현재가",
                 "current_value": "평가금액", "unrealized_pnl": "평가손익($)",
                 "unrealized_pnl_pct": "수익률(%)", "first_bought_at": "매수일",
+                "stale": "시세",
             }
             display_df.rename(columns=col_map, inplace=True)
             st.dataframe(
@@ -149,6 +156,7 @@ def render():
                     "평가금액": "${:,.0f}",
                     "평가손익($)": "${:+,.2f}",
                     "수익률(%)": "{:+.2f}%",
+                    "시세": lambda stale: "⏱ 지연" if stale else "",
                 }, na_rep="-")
                 .background_gradient(subset=["수익률(%)"], cmap="RdYlGn", vmin=-20, vmax=20),
                 use_container_width=True,
@@ -178,6 +186,12 @@ def render():
         )
         st.caption("열 머리글을 클릭하면 해당 열 기준으로 오름차순/내림차순 정렬이 됩니다.")
         st.caption(f"기준 시각: {summary.get('updated_at', 'N/A')}")
+        stale_tickers = summary.get("stale_tickers", [])
+        if stale_tickers:
+            st.caption(
+                f"⏱ 시세 갱신 중: {', '.join(stale_tickers)} — 최대 5분 전 가격으로 표시되며 "
+                "DB에는 반영되지 않습니다."
+            )
     else:
         st.info("보유 종목이 없습니다.")
 
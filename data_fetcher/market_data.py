@@ -3,7 +3,9 @@
 yfinance를 사용하여 주가 데이터, 종목 정보, 뉴스를 수집하고
 데이터베이스에 저장합니다.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import threading
 import time
 from typing import Optional
 
@@ -22,6 +24,10 @@ BATCH_SIZE = 100       # 배치당 종목 수 (yfinance는 100개까지 한번
 BATCH_DELAY_SEC = 1.5  # 배치 간 지연 (초)
 NEWS_TARGET_LIMIT = 100  # 뉴스 수집 대상 종목 수 제한 (상위 N개 + 보유 종목)
 
+# 일괄 현재가(fetch_realtime_prices) 캐시 — stale-while-revalidate
+QUOTE_CACHE_TTL = 10    # 이 시간(초) 이내의 시세는 그대로 재사용
+QUOTE_STALE_TTL = 300   # TTL 경과 후 이 시간까지는 stale 값을 즉시 반환하고 백그라운드 갱신
+
 
 class MarketDataFetcher:
     """
@@ -36,6 +42,11 @@ class MarketDataFetcher:
 
     def __init__(self):
         self._cache: dict[str, yf.Ticker] = {}  # Ticker 객체 캐시
+        # 일괄 현재가 캐시: {ticker: (조회 시각(monotonic), price_dict)}
+        self._quote_cache: dict[str, tuple[float, dict]] = {}
+        self._quote_refreshing: set[str] = set()  # 백그라운드 갱신 진행 중인 종목
+        self._quote_lock = threading.Lock()
+        self._quote_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quote-refresh")
 
     MAX_CACHE_SIZE = 200  # 캐시 최대 크기 (메모리 누수 방지)
 
@@ -316,6 +327,112 @@ class MarketDataFetcher:
             logger.error(f"[{ticker}] 실시간 가격 조회 실패: {e}")
             return None
 
+    def fetch_realtime_prices(self, tickers: list[str]) -> dict[str, dict]:
+        """
+        여러 종목의 현재가를 일괄 조회합니다 (짧은 TTL 캐시 + stale-while-revalidate).
+
+          - QUOTE_CACHE_TTL 이내 캐시     : 그대로 반환
+          - QUOTE_STALE_TTL 이내 캐시     : "stale": True 표시 후 즉시 반환, 백그라운드 갱신
+          - 캐시 없음 / 너무 오래된 캐시   : yf.download 1회로 동기 조회
+
+        반환값: {ticker: price_dict} — fetch_realtime_price와 같은 형식
+                (일괄 조회분은 market_cap=None)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}
+
+        now = time.monotonic()
+        results: dict[str, dict] = {}
+        stale: list[str] = []
+        missing: list[str] = []
+        with self._quote_lock:
+            for ticker in tickers:
+                entry = self._quote_cache.get(ticker)
+                age = now - entry[0] if entry else None
+                if age is not None and age < QUOTE_CACHE_TTL:
+                    results[ticker] = entry[1]
+                elif age is not None and age < QUOTE_STALE_TTL:
+                    results[ticker] = {**entry[1], "stale": True}
+                    if ticker not in self._quote_refreshing:
+                        stale.append(ticker)
+                else:
+                    missing.append(ticker)
+            self._quote_refreshing.update(stale)
+
+        if stale:
+            self._quote_executor.submit(self._refresh_quotes, stale)
+        if missing:
+            results.update(self._download_quotes(missing))
+        return results
+
+    def _refresh_quotes(self, tickers: list[str]) -> None:
+        """stale 시세 백그라운드 갱신 (fetch_realtime_prices에서 제출)"""
+        try:
+            self._download_quotes(tickers)
+        except Exception as e:
+            logger.warning(f"[가격 수집] 백그라운드 시세 갱신 실패: {e}")
+        finally:
+            with self._quote_lock:
+                self._quote_refreshing.difference_update(tickers)
+
+    def _download_quotes(self, tickers: list[str]) -> dict[str, dict]:
+        """
+        yf.download 1회 호출로 현재가를 조회하고 캐시에 기록합니다.
+        일괄 응답에서 빠진 종목만 fetch_realtime_price로 개별 보완합니다.
+        """
+        results: dict[str, dict] = {}
+        try:
+            df = yf.download(
+                tickers,
+                period="5d",
+                interval="1d",
+                group_by="ticker",
+                auto_adjust=False,
+                progress=False,
+                threads=True,
+            )
+        except Exception as e:
+            logger.warning(f"[가격 수집] 일괄 현재가 조회 실패, 개별 조회로 대체: {e}")
+            df = None
+
+        if df is not None and not df.empty:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            downloaded = set(df.columns.get_level_values(0)) if isinstance(df.columns, pd.MultiIndex) else set()
+            for ticker in tickers:
+                if ticker not in downloaded:
+                    continue
+                bars = df[ticker].dropna(subset=["Close"])
+                if bars.empty:
+                    continue
+                price = float(bars["Close"].iloc[-1])
+                prev_close = float(bars["Close"].iloc[-2]) if len(bars) > 1 else price
+                change = price - prev_close
+                volume = bars["Volume"].iloc[-1]
+                results[ticker] = {
+                    "ticker": ticker,
+                    "price": price,
+                    "change": change,
+                    "change_pct": (change / prev_close * 100) if prev_close else 0.0,
+                    "volume": int(volume) if pd.notna(volume) else 0,
+                    "market_cap": None,
+                    "timestamp": now,
+                }
+
+        for ticker in tickers:
+            if ticker not in results:
+                data = self.fetch_realtime_price(ticker)
+                if data:
+                    results[ticker] = data
+
+        with self._quote_lock:
+            if len(self._quote_cache) + len(results) > self.MAX_CACHE_SIZE:
+                self._quote_cache.clear()
+            stamp = time.monotonic()
+            for ticker, data in results.items():
+                self._quote_cache[ticker] = (stamp, data)
+        return results
+
     def fetch_all_realtime_prices(self) -> dict[str, dict]:
         """
         watchlist 전체 종목의 현재가를 조회합니다.
@@ -134,16 +134,8 @@ def job_daily_ai_analysis():
         if buy_count > 0:
             recs = ai_analyzer.get_todays_recommendations()
             buy_recs = [r for r in recs if r["action"] in ("BUY", "STRONG_BUY")]
-            try:
-                from notifications.kakao import kakao_notifier
-                kakao_notifier.send_buy_recommendations(buy_recs)
-            except Exception as e:
-                logger.debug(f"[스케줄] 카카오 알림 스킵: {e}")
-            try:
-                from notifications.telegram import telegram_notifier
-                telegram_notifier.send_buy_recommendations(buy_recs)
-            except Exception as e:
-                logger.debug(f"[스케줄] 텔레그램 알림 스킵: {e}")
+            from notifications.dispatch import dispatch
+            dispatch(recommendations=buy_recs)
     except Exception as e:
         logger.error(f"[스케줄] AI 매수 분석 실패: {e}")
 
@@ -164,16 +156,8 @@ def job_sell_analysis():
         if sell_count > 0:
             signals = sell_analyzer.get_active_sell_signals()
             sell_sigs = [s for s in signals if s["signal"] in ("SELL", "STRONG_SELL")]
-            try:
-                from notifications.kakao import kakao_notifier
-                kakao_notifier.send_sell_signals(sell_sigs)
-            except Exception as e:
-                logger.debug(f"[스케줄] 카카오 알림 스킵: {e}")
-            try:
-                from notifications.telegram import telegram_notifier
-                telegram_notifier.send_sell_signals(sell_sigs)
-            except Exception as e:
-                logger.debug(f"[스케줄] 텔레그램 알림 스킵: {e}")
+            from notifications.dispatch import dispatch
+            dispatch(sell_signals=sell_sigs)
     except Exception as e:
         logger.error(f"[스케줄] AI 매도 분석 실패: {e}")
 
@@ -215,22 +199,47 @@ def job_price_alert_check():
         logger.error(f"[스케줄] 가격 알림 체크 실패: {e}")
 
 
+def _todays_signals() -> tuple[list[dict], list[dict]]:
+    """오늘의 매수 추천(BUY/STRONG_BUY)과 매도 신호(SELL/STRONG_SELL) — 조회 실패 시 빈 목록"""
+    buy_recs: list[dict] = []
+    sell_sigs: list[dict] = []
+    try:
+        from analysis.ai_analyzer import ai_analyzer
+        buy_recs = [
+            r for r in ai_analyzer.get_todays_recommendations() if r["action"] in ("BUY", "STRONG_BUY")
+        ]
+    except Exception as e:
+        logger.debug(f"[스케줄] 오늘의 매수 추천 조회 스킵: {e}")
+    try:
+        from analysis.sell_analyzer import sell_analyzer
+        sell_sigs = [
+            s for s in sell_analyzer.get_active_sell_signals() if s["signal"] in ("SELL", "STRONG_SELL")
+        ]
+    except Exception as e:
+        logger.debug(f"[스케줄] 오늘의 매도 신호 조회 스킵: {e}")
+    return buy_recs, sell_sigs
+
+
 def job_daily_portfolio_summary():
-    """일일 포트폴리오 요약 알림 (평일 장 마감 후 16:35)"""
+    """일일 포트폴리오 요약 + 오늘의 매수/매도 신호 정리 알림 (평일 장 마감 후 16:35)"""
     if not _is_nyse_trading_day():
         logger.debug("[스케줄] 휴장일, 포트폴리오 요약 스킵")
         return
     logger.info("[스케줄] 포트폴리오 요약 알림 시작")
     try:
-        from notifications.kakao import kakao_notifier
-        kakao_notifier.send_daily_summary()
+        # 요약(시세 조회 + 평가값 기록)은 1회만 계산해 모든 채널에 같은 값을 전달
+        from portfolio.portfolio_manager import portfolio_manager
+        summary = portfolio_manager.get_summary()
     except Exception as e:
-        logger.debug(f"[스케줄] 카카오 요약 알림 스킵: {e}")
+        logger.error(f"[스케줄] 포트폴리오 요약 계산 실패: {e}")
+        return
     try:
-        from notifications.telegram import telegram_notifier
-        telegram_notifier.send_daily_summary()
+        # 장 마감 일일 발송: 오늘의 신호를 요약과 함께 보내 텔레그램은 다이제스트 1건으로 받음
+        buy_recs, sell_sigs = _todays_signals()
+        from notifications.dispatch import dispatch
+        dispatch(recommendations=buy_recs, sell_signals=sell_sigs, daily_summary=summary)
     except Exception as e:
-        logger.debug(f"[스케줄] 텔레그램 요약 알림 스킵: {e}")
+        logger.debug(f"[스케줄] 요약 알림 스킵: {e}")
     logger.success("[스케줄] 포트폴리오 요약 알림 전송 완료")
 
 
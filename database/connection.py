@@ -20,6 +20,7 @@ _is_sqlite = "sqlite" in settings.DATABASE_URL
 _engine_kwargs = dict(
     echo=False,           # SQL 로그 출력 여부 (디버깅 시 True)
     pool_pre_ping=True,   # 연결 유효성 사전 확인
+    query_cache_size=1200,  # 컴파일된 SQL 캐시 크기 (기본 500, 반복 조회 구문 재컴파일 방지)
 )
 
 if _is_sqlite:
@@ -89,6 +90,19 @@ def _migrate_add_columns() -> None:
                     conn.rollback()
 
 
+def _migrate_add_indexes() -> None:
+    """기존 테이블에 모델에 새로 정의된 인덱스를 생성합니다.
+
+    create_all은 이미 존재하는 테이블의 인덱스를 추가하지 않으므로 별도로 처리합니다.
+    """
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                logger.warning(f"[마이그레이션] 인덱스 {index.name} 생성 실패: {e}")
+
+
 def init_db() -> None:
     """
     데이터베이스 초기화: 모든 테이블 생성
@@ -97,6 +111,7 @@ def init_db() -> None:
     logger.info("데이터베이스 초기화 중...")
     Base.metadata.create_all(bind=engine, checkfirst=True)
     _migrate_add_columns()
+    _migrate_add_indexes()
     logger.success("데이터베이스 초기화 완료")
 
 
@@ -110,16 +125,26 @@ def drop_all_tables() -> None:
 
 
 @contextmanager
-def get_db() -> Generator[Session, None, None]:
+def get_db(write_lock: bool = False) -> Generator[Session, None, None]:
     """
     데이터베이스 세션 컨텍스트 매니저
 
+    Args:
+        write_lock: True이면 SQLite에서 BEGIN IMMEDIATE로 트랜잭션을 시작해
+                    첫 SELECT 전에 쓰기 잠금을 확보합니다. 읽은 값으로 다시 쓰는
+                    (read-modify-write) 경로용이며, SQLite는 SELECT ... FOR UPDATE를
+                    지원하지 않고 pysqlite는 첫 DML 직전에야 BEGIN을 보내므로 필요합니다.
+                    다른 DB에서는 아무 동작도 하지 않습니다 (행 잠금은 FOR UPDATE로 처리).
+
     사용 예시:
         with get_db() as db:
             stocks = db.query(Stock).all()
     """
     db = SessionLocal()
     try:
+        if write_lock and db.get_bind().dialect.name == "sqlite":
+            # 다른 쓰기 트랜잭션이 끝날 때까지 busy_timeout 동안 대기 후 잠금 획득
+            db.execute(text("BEGIN IMMEDIATE"))
         yield db
         db.commit()
     except Exception as e:
@@ -30,6 +30,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
     func,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -48,6 +49,13 @@ class Stock(Base):
     yfinance의 Ticker.info 에서 메타 데이터를 수집합니다.
     """
     __tablename__ = "stocks"
+    __table_args__ = (
+        # 활성 종목만 담는 부분 인덱스 (SQLite는 Boolean을 0/1로 저장)
+        Index(
+            "ix_stocks_active", "id",
+            sqlite_where=text("is_active = 1"), postgresql_where=text("is_active"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     ticker: Mapped[str] = mapped_column(String(20), unique=True, nullable=False, index=True)
@@ -100,6 +108,8 @@ class PriceHistory(Base):
     __tablename__ = "price_history"
     __table_args__ = (
         UniqueConstraint("stock_id", "timestamp", "interval", name="uq_price_stock_ts_interval"),
+        # 종목별 최신 일봉 조회 (stock_id + interval 필터, timestamp 역순 정렬)
+        Index("ix_price_history_stock_interval_time", "stock_id", "interval", "timestamp"),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -333,6 +343,10 @@ class PriceAlert(Base):
     __tablename__ = "price_alerts"
     __table_args__ = (
         Index("ix_price_alerts_stock_type", "stock_id", "alert_type"),
+        Index(
+            "ix_price_alerts_active_stock", "stock_id",
+            sqlite_where=text("is_active = 1"), postgresql_where=text("is_active"),
+        ),
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -10,14 +10,19 @@ import statistics
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 
+import numpy as np
+
 from database.connection import get_db
 from database.models import Stock, TechnicalIndicator, PriceHistory, AIRecommendation
 from config.tickers import ALL_TICKERS, TICKER_INDEX
 
+# ETF를 제외한 스코어링 대상 (모듈 로드 시 1회 계산)
+WATCHLIST_NON_ETF = tuple(t for t in ALL_TICKERS if "ETF" not in TICKER_INDEX.get(t, ()))
+
 
 def compute_all_scores():
     """Reproduce get_priority_tickers() scoring for ALL stocks."""
-    watchlist = [t for t in ALL_TICKERS if "ETF" not in TICKER_INDEX.get(t, [])]
+    watchlist = WATCHLIST_NON_ETF
 
     regime_mom_w = 0.70
     regime_rev_w = 0.30
@@ -42,6 +47,9 @@ def compute_all_scores():
     all_scores = {}
     sub_scores = {}
     indicator_data = {}
+    scored_tickers = []
+    pre_penalty = []
+    close_rows = []
 
     with get_db() as db:
         latest_ind = db.query(TechnicalIndicator).order_by(TechnicalIndicator.date.desc()).first()
@@ -171,17 +179,9 @@ def compute_all_scores():
                 elif obv_chg < 0 and price_chg > 0:
                     obv_bonus = -1.0
 
-            # PENALTIES
-            knife_pen = 0.0
-            if len(price_rows) >= 4:
-                down_days = 0
-                for i in range(min(len(price_rows) - 1, 4)):
-                    if price_rows[i].close < price_rows[i + 1].close:
-                        down_days += 1
-                    else:
-                        break
-                if down_days >= 4: knife_pen = 0.4
-                elif down_days >= 3: knife_pen = 0.25
+            # PENALTIES (knife_pen은 루프 종료 후 전 종목 일괄 계산)
+            closes = [r.close for r in price_rows[:5]]
+            close_rows.append(closes + [np.nan] * (5 - len(closes)))
 
             if current_price and ind.ma_200 and current_price < ind.ma_200:
                 reversion *= 0.5
@@ -201,28 +201,19 @@ def compute_all_scores():
                 momentum *= 0.5
                 reversion *= 0.2
 
-            # FINAL
+            # FINAL (knife_pen 적용 전 단계까지)
             raw = regime_mom_w * momentum + regime_rev_w * reversion
             adjusted = raw * vol_mult + obv_bonus
-            final = adjusted * (1.0 - knife_pen)
-            final = max(final, 0.0)
-
-            # Also compute score WITHOUT vol_mult and WITHOUT obv_bonus for counterfactual
-            raw_no_vol_obv = raw * 1.0 + 0.0  # vol_mult=1.0, obv_bonus=0
-            final_no_vol_obv = raw_no_vol_obv * (1.0 - knife_pen)
-            final_no_vol_obv = max(final_no_vol_obv, 0.0)
 
-            all_scores[ticker] = round(final, 4)
+            scored_tickers.append(ticker)
+            pre_penalty.append((raw, adjusted))
             sub_scores[ticker] = {
                 "momentum": round(momentum, 4),
                 "reversion": round(reversion, 4),
                 "vol_mult": round(vol_mult, 2),
                 "vol_ratio": round(vol_ratio, 4) if vol_ratio else None,
                 "obv_bonus": round(obv_bonus, 2),
-                "knife_pen": round(knife_pen, 2),
                 "raw": round(raw, 4),
-                "final": round(final, 4),
-                "final_no_vol_obv": round(final_no_vol_obv, 4),
             }
             indicator_data[ticker] = {
                 "rsi_14": ind.rsi_14,
@@ -236,6 +227,26 @@ def compute_all_scores():
                 "market_cap": stock.market_cap,
             }
 
+        # 하락 칼날(falling knife) 패널티: 연속 하락일을 분기 없이 일괄 계산
+        # close_mat[:, 0]이 최신 종가. NaN 패딩은 비교 결과가 False이므로 연속 구간을 끊는다.
+        if scored_tickers:
+            close_mat = np.array(close_rows, dtype=np.float64)
+            steps = close_mat[:, :-1] < close_mat[:, 1:]
+            down_days = np.cumprod(steps.astype(np.int8), axis=1).sum(axis=1)
+            knife_pens = np.where(down_days >= 4, 0.4, np.where(down_days >= 3, 0.25, 0.0))
+
+            for ticker, (raw, adjusted), knife_pen in zip(scored_tickers, pre_penalty, knife_pens.tolist()):
+                final = max(adjusted * (1.0 - knife_pen), 0.0)
+                # Also compute score WITHOUT vol_mult and WITHOUT obv_bonus for counterfactual
+                final_no_vol_obv = max(raw * (1.0 - knife_pen), 0.0)
+
+                all_scores[ticker] = round(final, 4)
+                sub_scores[ticker].update({
+                    "knife_pen": round(knife_pen, 2),
+                    "final": round(final, 4),
+                    "final_no_vol_obv": round(final_no_vol_obv, 4),
+                })
+
         # AI recommendations
         ai_recs = {}
         today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -253,17 +264,28 @@ def compute_all_scores():
     return all_scores, sub_scores, indicator_data, ai_recs, regime_name, regime_mom_w, regime_rev_w, vix_level
 
 
+def _emit(lines):
+    """누적된 리포트 라인을 한 번의 write로 출력하고 버퍼를 비운다."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+
 def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, regime_name, regime_mom_w, regime_rev_w, vix_level):
     scores_list = list(all_scores.values())
-    sorted_tickers = sorted(all_scores, key=lambda t: all_scores[t], reverse=True)
+    # 전 종목 정렬은 NumPy argsort로 처리 (stable → 동점 시 기존 sorted()와 같은 순서)
+    scores_arr = np.fromiter(all_scores.values(), dtype=np.float64, count=len(all_scores))
+    order = np.argsort(-scores_arr, kind="stable")
+    sorted_tickers = np.array(list(all_scores), dtype=object)[order].tolist()
     top50 = set(sorted_tickers[:50])
+    lines = []
 
     # ============================================================
     # ITEM 2: SECTOR + MARKET CAP BIAS (deeper)
     # ============================================================
-    print("=" * 70)
-    print("SECTOR BIAS ANALYSIS (Top 50 vs All)")
-    print("=" * 70)
+    lines.append("=" * 70)
+    lines.append("SECTOR BIAS ANALYSIS (Top 50 vs All)")
+    lines.append("=" * 70)
 
     sector_top50 = Counter()
     sector_all = Counter()
@@ -273,18 +295,18 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
         if t in top50:
             sector_top50[sect] += 1
 
-    print(f"\n  {'Sector':<30} {'Top50':>5} {'All':>5} {'Top50%':>7} {'All%':>7} {'Over/Under':>12}")
-    print(f"  {'-'*30} {'-'*5} {'-'*5} {'-'*7} {'-'*7} {'-'*12}")
-    for sect in sorted(sector_all.keys(), key=lambda s: sector_top50.get(s, 0), reverse=True):
+    lines.append(f"\n  {'Sector':<30} {'Top50':>5} {'All':>5} {'Top50%':>7} {'All%':>7} {'Over/Under':>12}")
+    lines.append(f"  {'-'*30} {'-'*5} {'-'*5} {'-'*7} {'-'*7} {'-'*12}")
+    for sect in sorted(sector_all.keys(), key=sector_top50.__getitem__, reverse=True):
         t50 = sector_top50.get(sect, 0)
         total = sector_all[sect]
         t50_pct = t50 / 50 * 100
         all_pct = total / len(all_scores) * 100
         over = t50_pct - all_pct
-        print(f"  {sect:<30} {t50:>5} {total:>5} {t50_pct:>6.1f}% {all_pct:>6.1f}% {over:>+11.1f}%")
+        lines.append(f"  {sect:<30} {t50:>5} {total:>5} {t50_pct:>6.1f}% {all_pct:>6.1f}% {over:>+11.1f}%")
 
     # Market Cap distribution
-    print(f"\n--- Market Cap Distribution ---")
+    lines.append(f"\n--- Market Cap Distribution ---")
 
     def mcap_bucket(mcap):
         if mcap is None: return "Unknown"
@@ -302,8 +324,8 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
         if t in top50:
             mcap_top50[bucket] += 1
 
-    print(f"\n  {'Market Cap':<20} {'Top50':>5} {'All':>5} {'Top50%':>7} {'All%':>7} {'Over/Under':>12}")
-    print(f"  {'-'*20} {'-'*5} {'-'*5} {'-'*7} {'-'*7} {'-'*12}")
+    lines.append(f"\n  {'Market Cap':<20} {'Top50':>5} {'All':>5} {'Top50%':>7} {'All%':>7} {'Over/Under':>12}")
+    lines.append(f"  {'-'*20} {'-'*5} {'-'*5} {'-'*7} {'-'*7} {'-'*12}")
     for bucket in ["Mega (>200B)", "Large (10-200B)", "Mid (2-10B)", "Small (<2B)", "Unknown"]:
         t50 = mcap_top50.get(bucket, 0)
         total = mcap_all.get(bucket, 0)
@@ -311,17 +333,18 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
         t50_pct = t50 / 50 * 100
         all_pct = total / len(all_scores) * 100
         over = t50_pct - all_pct
-        print(f"  {bucket:<20} {t50:>5} {total:>5} {t50_pct:>6.1f}% {all_pct:>6.1f}% {over:>+11.1f}%")
+        lines.append(f"  {bucket:<20} {t50:>5} {total:>5} {t50_pct:>6.1f}% {all_pct:>6.1f}% {over:>+11.1f}%")
+    _emit(lines)
 
     # ============================================================
     # ITEM 5: VIX / REGIME WEIGHT EFFECT
     # ============================================================
-    print(f"\n{'=' * 70}")
-    print(f"VIX / REGIME WEIGHT ANALYSIS")
-    print(f"{'=' * 70}")
-    print(f"\n  Current VIX: {vix_level}")
-    print(f"  Current Regime: {regime_name}")
-    print(f"  Weights: momentum={regime_mom_w:.2f}, reversion={regime_rev_w:.2f}")
+    lines.append(f"\n{'=' * 70}")
+    lines.append(f"VIX / REGIME WEIGHT ANALYSIS")
+    lines.append(f"{'=' * 70}")
+    lines.append(f"\n  Current VIX: {vix_level}")
+    lines.append(f"  Current Regime: {regime_name}")
+    lines.append(f"  Weights: momentum={regime_mom_w:.2f}, reversion={regime_rev_w:.2f}")
 
     # Simulate what top 50 would look like under different regimes
     for sim_name, sim_mom, sim_rev in [("trending", 0.70, 0.30), ("transitional", 0.45, 0.55), ("high_volatility", 0.25, 0.75)]:
@@ -333,105 +356,108 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
             fin_sim = adj_sim * (1.0 - s["knife_pen"])
             fin_sim = max(fin_sim, 0.0)
             sim_scores[t] = fin_sim
-        sim_sorted = sorted(sim_scores, key=lambda t: sim_scores[t], reverse=True)
+        sim_sorted = sorted(sim_scores, key=sim_scores.__getitem__, reverse=True)
         sim_top50 = set(sim_sorted[:50])
 
         overlap_with_current = len(top50 & sim_top50)
         sim_buy = [t for t in sim_top50 if t in ai_recs and ai_recs[t]["action"] in ("BUY", "STRONG_BUY")]
         current_marker = " <-- CURRENT" if sim_name == regime_name else ""
-        print(f"\n  Regime: {sim_name} (mom={sim_mom}, rev={sim_rev}){current_marker}")
-        print(f"    Overlap with current Top 50: {overlap_with_current}/50")
-        print(f"    Top 5: {[(t, round(sim_scores[t], 2)) for t in sim_sorted[:5]]}")
-        print(f"    BUY hits in this top 50: {len(sim_buy)}/50")
+        lines.append(f"\n  Regime: {sim_name} (mom={sim_mom}, rev={sim_rev}){current_marker}")
+        lines.append(f"    Overlap with current Top 50: {overlap_with_current}/50")
+        lines.append(f"    Top 5: {[(t, round(sim_scores[t], 2)) for t in sim_sorted[:5]]}")
+        lines.append(f"    BUY hits in this top 50: {len(sim_buy)}/50")
+    _emit(lines)
 
     # ============================================================
     # ITEM 6: TOP 50 -> BUY HIT RATE (detailed)
     # ============================================================
-    print(f"\n{'=' * 70}")
-    print(f"TOP 50 -> BUY HIT RATE (AI Accuracy)")
-    print(f"{'=' * 70}")
+    lines.append(f"\n{'=' * 70}")
+    lines.append(f"TOP 50 -> BUY HIT RATE (AI Accuracy)")
+    lines.append(f"{'=' * 70}")
 
     if ai_recs:
         total_recs = len(ai_recs)
         buy_recs = sum(1 for r in ai_recs.values() if r["action"] in ("BUY", "STRONG_BUY"))
         hold_recs = sum(1 for r in ai_recs.values() if r["action"] == "HOLD")
 
-        print(f"\n  AI analyzed: {total_recs} stocks (= Top 50 sent to AI)")
-        print(f"  BUY/STRONG_BUY: {buy_recs} ({buy_recs/total_recs*100:.1f}%)")
-        print(f"  HOLD:           {hold_recs} ({hold_recs/total_recs*100:.1f}%)")
+        lines.append(f"\n  AI analyzed: {total_recs} stocks (= Top 50 sent to AI)")
+        lines.append(f"  BUY/STRONG_BUY: {buy_recs} ({buy_recs/total_recs*100:.1f}%)")
+        lines.append(f"  HOLD:           {hold_recs} ({hold_recs/total_recs*100:.1f}%)")
 
         # Score distribution comparison within Top 50
         buy_scores_in_top = [all_scores[t] for t in ai_recs if ai_recs[t]["action"] in ("BUY", "STRONG_BUY") and t in all_scores]
         hold_scores_in_top = [all_scores[t] for t in ai_recs if ai_recs[t]["action"] == "HOLD" and t in all_scores]
 
         if buy_scores_in_top and hold_scores_in_top:
-            print(f"\n  Within Top 50, Priority Score comparison:")
-            print(f"    BUY:  mean={statistics.mean(buy_scores_in_top):.3f}, median={statistics.median(buy_scores_in_top):.3f}")
-            print(f"    HOLD: mean={statistics.mean(hold_scores_in_top):.3f}, median={statistics.median(hold_scores_in_top):.3f}")
-            print(f"    Difference: {statistics.mean(buy_scores_in_top) - statistics.mean(hold_scores_in_top):+.3f}")
+            lines.append(f"\n  Within Top 50, Priority Score comparison:")
+            lines.append(f"    BUY:  mean={statistics.mean(buy_scores_in_top):.3f}, median={statistics.median(buy_scores_in_top):.3f}")
+            lines.append(f"    HOLD: mean={statistics.mean(hold_scores_in_top):.3f}, median={statistics.median(hold_scores_in_top):.3f}")
+            lines.append(f"    Difference: {statistics.mean(buy_scores_in_top) - statistics.mean(hold_scores_in_top):+.3f}")
 
         # Score rank vs AI decision
-        print(f"\n  Score Rank vs AI Decision (within Top 50):")
-        print(f"  {'Rank':>6} {'Ticker':>8} {'Score':>8} {'Action':>12} {'Confidence':>12}")
-        print(f"  {'-'*6} {'-'*8} {'-'*8} {'-'*12} {'-'*12}")
+        lines.append(f"\n  Score Rank vs AI Decision (within Top 50):")
+        lines.append(f"  {'Rank':>6} {'Ticker':>8} {'Score':>8} {'Action':>12} {'Confidence':>12}")
+        lines.append(f"  {'-'*6} {'-'*8} {'-'*8} {'-'*12} {'-'*12}")
         for i, t in enumerate(sorted_tickers[:50]):
             if t in ai_recs:
                 r = ai_recs[t]
                 marker = " ***" if r["action"] in ("BUY", "STRONG_BUY") else ""
-                print(f"  {i+1:>6} {t:>8} {all_scores[t]:>8.2f} {r['action']:>12} {r['confidence']:>11.2f}{marker}")
+                lines.append(f"  {i+1:>6} {t:>8} {all_scores[t]:>8.2f} {r['action']:>12} {r['confidence']:>11.2f}{marker}")
     else:
-        print("  No AI recommendations found.")
+        lines.append("  No AI recommendations found.")
+    _emit(lines)
 
     # ============================================================
     # ITEM 7: NATURAL CUTOFF POINT ANALYSIS
     # ============================================================
-    print(f"\n{'=' * 70}")
-    print(f"THRESHOLD / NATURAL CUTOFF ANALYSIS")
-    print(f"{'=' * 70}")
+    lines.append(f"\n{'=' * 70}")
+    lines.append(f"THRESHOLD / NATURAL CUTOFF ANALYSIS")
+    lines.append(f"{'=' * 70}")
 
     sorted_scores = sorted(scores_list, reverse=True)
 
     # Score gaps analysis - find largest gaps between consecutive scores
-    print(f"\n  --- Score Gap Analysis (largest gaps in sorted scores) ---")
+    lines.append(f"\n  --- Score Gap Analysis (largest gaps in sorted scores) ---")
     gaps = []
     for i in range(len(sorted_scores) - 1):
         gap = sorted_scores[i] - sorted_scores[i + 1]
         gaps.append((i + 1, sorted_scores[i], sorted_scores[i + 1], gap))
 
     gaps.sort(key=lambda x: x[3], reverse=True)
-    print(f"  {'Rank':>6} {'Above':>8} {'Below':>8} {'Gap':>8} {'Cutoff would select N':>24}")
-    print(f"  {'-'*6} {'-'*8} {'-'*8} {'-'*8} {'-'*24}")
+    lines.append(f"  {'Rank':>6} {'Above':>8} {'Below':>8} {'Gap':>8} {'Cutoff would select N':>24}")
+    lines.append(f"  {'-'*6} {'-'*8} {'-'*8} {'-'*8} {'-'*24}")
     for rank, above, below, gap in gaps[:15]:
-        print(f"  {rank:>6} {above:>8.3f} {below:>8.3f} {gap:>8.3f} {rank:>24}")
+        lines.append(f"  {rank:>6} {above:>8.3f} {below:>8.3f} {gap:>8.3f} {rank:>24}")
 
     # Threshold sensitivity
-    print(f"\n  --- Threshold Sensitivity ---")
-    print(f"  {'Threshold':>10} {'Passing':>8} {'% of Total':>12} {'Would select if top50':>24}")
-    print(f"  {'-'*10} {'-'*8} {'-'*12} {'-'*24}")
+    lines.append(f"\n  --- Threshold Sensitivity ---")
+    lines.append(f"  {'Threshold':>10} {'Passing':>8} {'% of Total':>12} {'Would select if top50':>24}")
+    lines.append(f"  {'-'*10} {'-'*8} {'-'*12} {'-'*24}")
     for threshold in [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 1.75, 2.0, 2.25, 2.5, 3.0]:
         passing = sum(1 for s in scores_list if s > threshold)
         pct = passing / len(scores_list) * 100
         top_n = min(passing, 50)
-        print(f"  {threshold:>10.2f} {passing:>8} {pct:>11.1f}% {top_n:>24}")
+        lines.append(f"  {threshold:>10.2f} {passing:>8} {pct:>11.1f}% {top_n:>24}")
 
     # Jenks natural breaks approximation (find where density drops)
-    print(f"\n  --- Score Density (count per 0.25 bin) ---")
+    lines.append(f"\n  --- Score Density (count per 0.25 bin) ---")
     for start in [i * 0.25 for i in range(20)]:
         end = start + 0.25
         count = sum(1 for s in scores_list if start <= s < end)
         bar = "#" * min(count, 50)
-        print(f"  [{start:>5.2f}-{end:>5.2f}): {count:>4} {bar}")
+        lines.append(f"  [{start:>5.2f}-{end:>5.2f}): {count:>4} {bar}")
+    _emit(lines)
 
     # ============================================================
     # ITEM 8: VOLUME MULTIPLIER & OBV BONUS RANK IMPACT
     # ============================================================
-    print(f"\n{'=' * 70}")
-    print(f"VOLUME MULTIPLIER & OBV BONUS RANK IMPACT")
-    print(f"{'=' * 70}")
+    lines.append(f"\n{'=' * 70}")
+    lines.append(f"VOLUME MULTIPLIER & OBV BONUS RANK IMPACT")
+    lines.append(f"{'=' * 70}")
 
     # Counterfactual: What would rankings be WITHOUT vol_mult and obv_bonus?
     counterfactual_scores = {t: sub_scores[t]["final_no_vol_obv"] for t in sub_scores}
-    cf_sorted = sorted(counterfactual_scores, key=lambda t: counterfactual_scores[t], reverse=True)
+    cf_sorted = sorted(counterfactual_scores, key=counterfactual_scores.__getitem__, reverse=True)
     cf_top50 = set(cf_sorted[:50])
 
     actual_top50 = top50
@@ -439,24 +465,24 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
     gained = actual_top50 - cf_top50  # in actual but not counterfactual
     lost = cf_top50 - actual_top50    # in counterfactual but not actual
 
-    print(f"\n  --- Counterfactual: Scores without Vol Mult & OBV Bonus ---")
-    print(f"  Overlap with actual Top 50: {overlap}/50")
-    print(f"  Gained by vol/obv (in actual, not in CF): {len(gained)} stocks")
-    print(f"  Lost by vol/obv (in CF, not in actual):   {len(lost)} stocks")
+    lines.append(f"\n  --- Counterfactual: Scores without Vol Mult & OBV Bonus ---")
+    lines.append(f"  Overlap with actual Top 50: {overlap}/50")
+    lines.append(f"  Gained by vol/obv (in actual, not in CF): {len(gained)} stocks")
+    lines.append(f"  Lost by vol/obv (in CF, not in actual):   {len(lost)} stocks")
 
     if gained:
-        print(f"\n  Stocks GAINED by volume/OBV effects:")
-        for t in sorted(gained, key=lambda t: all_scores[t], reverse=True)[:10]:
+        lines.append(f"\n  Stocks GAINED by volume/OBV effects:")
+        for t in sorted(gained, key=all_scores.__getitem__, reverse=True)[:10]:
             s = sub_scores[t]
-            print(f"    {t:>8}: actual={s['final']:.2f} cf={s['final_no_vol_obv']:.2f} "
+            lines.append(f"    {t:>8}: actual={s['final']:.2f} cf={s['final_no_vol_obv']:.2f} "
                   f"vol={s['vol_mult']:.1f} obv={s['obv_bonus']:+.1f} "
                   f"rank_change=+{cf_sorted.index(t)+1 - sorted_tickers.index(t)-1}")
 
     if lost:
-        print(f"\n  Stocks LOST by volume/OBV effects:")
-        for t in sorted(lost, key=lambda t: counterfactual_scores[t], reverse=True)[:10]:
+        lines.append(f"\n  Stocks LOST by volume/OBV effects:")
+        for t in sorted(lost, key=counterfactual_scores.__getitem__, reverse=True)[:10]:
             s = sub_scores[t]
-            print(f"    {t:>8}: actual={s['final']:.2f} cf={s['final_no_vol_obv']:.2f} "
+            lines.append(f"    {t:>8}: actual={s['final']:.2f} cf={s['final_no_vol_obv']:.2f} "
                   f"vol={s['vol_mult']:.1f} obv={s['obv_bonus']:+.1f} "
                   f"rank_change={cf_sorted.index(t)+1 - sorted_tickers.index(t)-1}")
 
@@ -469,26 +495,26 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
     max_rank_change = max(rank_diffs)
     max_rank_ticker = max(common, key=lambda t: abs(actual_ranks[t] - cf_ranks[t]))
 
-    print(f"\n  --- Rank Displacement Statistics ---")
-    print(f"  Average rank change: {avg_rank_change:.1f} positions")
-    print(f"  Max rank change:     {max_rank_change} positions ({max_rank_ticker})")
-    print(f"  Median rank change:  {statistics.median(rank_diffs):.0f} positions")
+    lines.append(f"\n  --- Rank Displacement Statistics ---")
+    lines.append(f"  Average rank change: {avg_rank_change:.1f} positions")
+    lines.append(f"  Max rank change:     {max_rank_change} positions ({max_rank_ticker})")
+    lines.append(f"  Median rank change:  {statistics.median(rank_diffs):.0f} positions")
 
     # Volume ratio distribution deep dive
-    print(f"\n  --- Volume Ratio Distribution (latest_vol / vol_ma_20) ---")
+    lines.append(f"\n  --- Volume Ratio Distribution (latest_vol / vol_ma_20) ---")
     vol_ratios = [sub_scores[t]["vol_ratio"] for t in sub_scores if sub_scores[t]["vol_ratio"] is not None]
     if vol_ratios:
-        print(f"  Total with volume data: {len(vol_ratios)}")
-        print(f"  Min:    {min(vol_ratios):.4f}")
-        print(f"  Max:    {max(vol_ratios):.4f}")
-        print(f"  Mean:   {statistics.mean(vol_ratios):.4f}")
-        print(f"  Median: {statistics.median(vol_ratios):.4f}")
-        print(f"  P10:    {sorted(vol_ratios)[int(len(vol_ratios)*0.1)]:.4f}")
-        print(f"  P25:    {sorted(vol_ratios)[int(len(vol_ratios)*0.25)]:.4f}")
-        print(f"  P75:    {sorted(vol_ratios)[int(len(vol_ratios)*0.75)]:.4f}")
-        print(f"  P90:    {sorted(vol_ratios)[int(len(vol_ratios)*0.9)]:.4f}")
-
-        print(f"\n  Volume Ratio Buckets:")
+        lines.append(f"  Total with volume data: {len(vol_ratios)}")
+        lines.append(f"  Min:    {min(vol_ratios):.4f}")
+        lines.append(f"  Max:    {max(vol_ratios):.4f}")
+        lines.append(f"  Mean:   {statistics.mean(vol_ratios):.4f}")
+        lines.append(f"  Median: {statistics.median(vol_ratios):.4f}")
+        lines.append(f"  P10:    {sorted(vol_ratios)[int(len(vol_ratios)*0.1)]:.4f}")
+        lines.append(f"  P25:    {sorted(vol_ratios)[int(len(vol_ratios)*0.25)]:.4f}")
+        lines.append(f"  P75:    {sorted(vol_ratios)[int(len(vol_ratios)*0.75)]:.4f}")
+        lines.append(f"  P90:    {sorted(vol_ratios)[int(len(vol_ratios)*0.9)]:.4f}")
+
+        lines.append(f"\n  Volume Ratio Buckets:")
         vol_buckets = [
             (0, 0.3, "Very Low (<0.3x)"),
             (0.3, 0.5, "Low (0.3-0.5x)  -> 0.6x mult"),
@@ -501,19 +527,20 @@ def run_supplemental_analysis(all_scores, sub_scores, indicator_data, ai_recs, r
             count = sum(1 for v in vol_ratios if lo <= v < hi)
             pct = count / len(vol_ratios) * 100
             bar = "#" * min(count, 40)
-            print(f"    {label:<38} {count:>4} ({pct:>5.1f}%) {bar}")
+            lines.append(f"    {label:<38} {count:>4} ({pct:>5.1f}%) {bar}")
 
     # OBV signal analysis
-    print(f"\n  --- OBV Signal Frequency ---")
+    lines.append(f"\n  --- OBV Signal Frequency ---")
     obv_vals = [sub_scores[t]["obv_bonus"] for t in sub_scores]
     no_prev = sum(1 for t in sub_scores if sub_scores[t]["obv_bonus"] == 0.0)
     bull_div = sum(1 for t in sub_scores if sub_scores[t]["obv_bonus"] == 1.5)
     confirm = sum(1 for t in sub_scores if sub_scores[t]["obv_bonus"] == 0.5)
     bear_div = sum(1 for t in sub_scores if sub_scores[t]["obv_bonus"] == -1.0)
-    print(f"  No OBV signal:       {no_prev} ({no_prev/len(sub_scores)*100:.1f}%)")
-    print(f"  Confirming uptrend:  {confirm} ({confirm/len(sub_scores)*100:.1f}%)")
-    print(f"  Bullish divergence:  {bull_div} ({bull_div/len(sub_scores)*100:.1f}%)")
-    print(f"  Bearish divergence:  {bear_div} ({bear_div/len(sub_scores)*100:.1f}%)")
+    lines.append(f"  No OBV signal:       {no_prev} ({no_prev/len(sub_scores)*100:.1f}%)")
+    lines.append(f"  Confirming uptrend:  {confirm} ({confirm/len(sub_scores)*100:.1f}%)")
+    lines.append(f"  Bullish divergence:  {bull_div} ({bull_div/len(sub_scores)*100:.1f}%)")
+    lines.append(f"  Bearish divergence:  {bear_div} ({bear_div/len(sub_scores)*100:.1f}%)")
+    _emit(lines)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,33 @@
+"""
+알림 채널(카카오/텔레그램) 공용 구성요소
+HTTP 클라이언트와 메시지 포맷에서 함께 쓰는 아이콘/분류 테이블을 한 곳에서 정의합니다.
+"""
+import importlib.util
+
+import httpx
+
+# 메시지 포맷에서 쓰는 아이콘/정렬 테이블 (호출마다 dict를 새로 만들지 않도록 모듈 상수로)
+URGENCY_ICON = {"HIGH": "🔴", "NORMAL": "🟠", "LOW": "🟡"}
+URGENCY_ORDER = {"HIGH": 0, "NORMAL": 1, "LOW": 2}
+ALERT_ICON = {"STOP_LOSS": "🔴", "TARGET_PRICE": "🎯", "VOLUME_SURGE": "📊"}
+BUY_ACTIONS = frozenset({"BUY", "STRONG_BUY"})
+SELL_SIGNALS = frozenset({"SELL", "STRONG_SELL"})
+
+# kauth/kapi.kakao.com, api.telegram.org 연결을 keep-alive로 재사용하는 공유 클라이언트.
+# h2 패키지가 있으면 HTTP/2로 열어 동시 전송(notifications.dispatch)을 호스트별 한 TLS 연결에서 다중화
+HTTP_CLIENT = httpx.Client(
+    http2=importlib.util.find_spec("h2") is not None,
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+)
+
+
+def order_by_urgency(signals: list[dict]) -> list[dict]:
+    """urgency HIGH → NORMAL → LOW 순으로 안정 정렬 (알 수 없는 값은 LOW 취급).
+
+    건수가 적고 키가 3종뿐이므로 정렬 대신 O(N) 버킷 분할로 처리.
+    """
+    buckets: tuple[list, list, list] = ([], [], [])
+    for s in signals:
+        buckets[URGENCY_ORDER.get(s.get("urgency", "LOW"), 2)].append(s)
+    return buckets[0] + buckets[1] + buckets[2]
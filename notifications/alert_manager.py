@@ -10,12 +10,17 @@
 중복 방지:
   - COOLDOWN_MINUTES(60분) 이내 동일 종목×유형 재발화 억제
 """
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import numpy as np
 from loguru import logger
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, func, select
+from sqlalchemy.orm import aliased, joinedload
 
 from database.connection import get_db
 from database.models import (
@@ -27,20 +32,34 @@ from database.models import (
     Stock,
     TechnicalIndicator,
 )
+from notifications.dispatch import dispatch
 
 __all__ = ["AlertManager", "VALID_ALERT_TYPES", "alert_manager"]
 
 # ── 모듈 상수 ──────────────────────────────────────────────────────────────────
 VALID_ALERT_TYPES: frozenset = frozenset({"STOP_LOSS", "TARGET_PRICE", "VOLUME_SURGE", "TRAILING_STOP"})
 
+# 가격 비교로 발화하는 알림 유형의 정수 코드 (NumPy 마스크 계산용, 그 외 유형은 -1)
+_STOP_LOSS_CODE = 0
+_TARGET_PRICE_CODE = 1
+_PRICE_ALERT_CODES: dict[str, int] = {"STOP_LOSS": _STOP_LOSS_CODE, "TARGET_PRICE": _TARGET_PRICE_CODE}
+
+# 알림 조건 원천 테이블의 변경 감지용 버전 조회 (한 행 집계 1회).
+# 삭제 → 건수, 수정 → updated_at, AI 추천 추가 → 최대 id가 바뀜
+_CONDITIONS_VERSION = select(
+    func.count(PriceAlert.id),
+    func.max(PriceAlert.updated_at),
+    select(func.max(AIRecommendation.id)).scalar_subquery(),
+).select_from(PriceAlert)
+
 
 # ── 내부 헬퍼 데이터클래스 ────────────────────────────────────────────────────
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class _AlertCondition:
-    """DB 레코드 없이 fallback 임계값을 표현하는 경량 데이터 홀더.
+    """DB 레코드 없이 알림 임계값을 표현하는 경량 데이터 홀더.
 
-    check_portfolio_alerts에서 AIRecommendation의 stop_loss/target_price를
-    PriceAlert ORM 객체 없이 표현할 때 사용합니다.
+    알림 조건 캐시에서 PriceAlert 및 AIRecommendation의 stop_loss/target_price를
+    ORM 객체 없이 표현할 때 사용합니다. 틱마다 다수 생성되므로 slots로 인스턴스 dict를 생략합니다.
     """
     alert_type: str
     threshold_value: float
@@ -57,42 +76,140 @@ class AlertManager:
         "VOLUME_SURGE": 360,   # 거래량 급등은 하루에 ~1회
     }
     TRAILING_STOP_PCT = 0.10  # 최고가 대비 -10% 하락 시 트레일링 스톱 발동 (ATR 없을 때 기본값)
+    CONDITIONS_CACHE_TTL = 300  # 알림 조건(PriceAlert + AI 추천 fallback) 캐시 최대 유지 시간 (초)
+
+    def __init__(self):
+        # {stock_id: [(_AlertCondition, price_alert_id | None), ...]}
+        # 스케줄러 워커 스레드와 대시보드(set_alert)가 동시에 접근하므로 Lock으로 보호
+        self._conditions_cache: dict[int, list[tuple]] = {}
+        self._conditions_cache_expiry: float = 0.0
+        self._conditions_cache_version: Optional[tuple] = None
+        self._conditions_lock = threading.Lock()
 
     # ── 내부 유틸리티 ──────────────────────────────────────────────────────────
 
     def _now(self) -> datetime:
         return datetime.now(timezone.utc).replace(tzinfo=None)
 
-    def _is_in_cooldown(self, db, stock_id: int, alert_type: str) -> bool:
-        """마지막 발화 후 유형별 쿨다운 시간 이내이면 True"""
+    def _load_last_fired(self, db, now: Optional[datetime] = None) -> dict[tuple[int, str], datetime]:
+        """가장 긴 쿨다운 구간 내 (stock_id, alert_type)별 마지막 발화 시각을 1회 쿼리로 조회"""
+        now = now or self._now()
+        cutoff = now - timedelta(
+            minutes=max(self.COOLDOWN_MINUTES, *self.COOLDOWN_MAP.values())
+        )
+        rows = (
+            db.query(AlertHistory.stock_id, AlertHistory.alert_type, func.max(AlertHistory.triggered_at))
+            .filter(AlertHistory.triggered_at >= cutoff)
+            .group_by(AlertHistory.stock_id, AlertHistory.alert_type)
+            .all()
+        )
+        return {(stock_id, alert_type): ts for stock_id, alert_type, ts in rows}
+
+    def _is_in_cooldown(self, last_fired: dict, stock_id: int, alert_type: str,
+                        now: Optional[datetime] = None) -> bool:
+        """마지막 발화 후 유형별 쿨다운 시간 이내이면 True (_load_last_fired 결과 기준)"""
+        last = last_fired.get((stock_id, alert_type))
+        if last is None:
+            return False
         cooldown_minutes = self.COOLDOWN_MAP.get(alert_type, self.COOLDOWN_MINUTES)
-        cutoff = self._now() - timedelta(minutes=cooldown_minutes)
-        recent = (
-            db.query(AlertHistory)
+        return last >= (now or self._now()) - timedelta(minutes=cooldown_minutes)
+
+    def _latest_by_stock(self, db, model, order_col, *criteria) -> dict:
+        """stock_id별 order_col 기준 최신 1행을 단일 쿼리로 조회합니다.
+
+        row_number() 윈도 함수를 사용하므로 SQLite(3.25+)와 PostgreSQL 모두 지원합니다.
+        order_col 값이 같은 행끼리는 id가 큰(나중에 저장된) 행을 최신으로 봅니다.
+
+        Returns:
+            {stock_id: model 인스턴스}
+        """
+        rn = func.row_number().over(
+            partition_by=model.stock_id, order_by=(desc(order_col), desc(model.id))
+        ).label("rn")
+        subq = select(model, rn).where(*criteria).subquery()
+        latest = aliased(model, subq)
+        rows = db.query(latest).filter(subq.c.rn == 1).all()
+        return {row.stock_id: row for row in rows}
+
+    def _load_conditions(self, db, stock_ids: list[int]) -> dict[int, list[tuple]]:
+        """종목별 알림 조건을 일괄 조회합니다.
+
+        활성 PriceAlert가 있으면 그것을, 없으면 최신 AIRecommendation의
+        stop_loss/target_price를 fallback 조건으로 사용합니다.
+
+        Returns:
+            {stock_id: [(_AlertCondition, price_alert_id | None), ...]}
+        """
+        conditions: dict[int, list[tuple]] = {sid: [] for sid in stock_ids}
+        for alert in (
+            db.query(PriceAlert)
             .filter(
                 and_(
-                    AlertHistory.stock_id == stock_id,
-                    AlertHistory.alert_type == alert_type,
-                    AlertHistory.triggered_at >= cutoff,
+                    PriceAlert.stock_id.in_(stock_ids),
+                    PriceAlert.is_active,
                 )
             )
-            .first()
-        )
-        return recent is not None
+            .all()
+        ):
+            conditions[alert.stock_id].append(
+                (_AlertCondition(alert.alert_type, alert.threshold_value), alert.id)
+            )
 
-    def _record_alert(self, db, stock_id: int, alert_type: str,
-                      trigger_price: Optional[float], message: str) -> AlertHistory:
-        """AlertHistory 저장"""
-        ah = AlertHistory(
+        # fallback: PriceAlert가 없는 종목만 최신 AI 추천 조회
+        fallback_ids = [sid for sid, conds in conditions.items() if not conds]
+        if fallback_ids:
+            latest_recs = self._latest_by_stock(
+                db, AIRecommendation, AIRecommendation.recommendation_date,
+                AIRecommendation.stock_id.in_(fallback_ids),
+            )
+            for sid, rec in latest_recs.items():
+                if rec.stop_loss:
+                    conditions[sid].append((_AlertCondition("STOP_LOSS", rec.stop_loss), None))
+                if rec.target_price:
+                    conditions[sid].append((_AlertCondition("TARGET_PRICE", rec.target_price), None))
+
+        return conditions
+
+    def _get_conditions(self, db, stock_ids: list[int]) -> dict[int, list[tuple]]:
+        """캐시를 거쳐 알림 조건을 반환합니다.
+
+        호출마다 _CONDITIONS_VERSION(집계 1행)으로 원천 테이블 변경 여부를 확인하고,
+        버전이 바뀌었거나 TTL이 지났거나 캐시에 없는 종목(신규 매수)이 있으면 전체를 다시 적재합니다.
+        이 버전 확인 덕분에 다른 프로세스(대시보드 등)에서 바꾼 조건도 다음 체크에 반영됩니다.
+        단, 같은 초 안에 같은 알림을 다시 수정한 경우처럼 버전이 같게 나오는 변경은
+        같은 프로세스의 invalidate_conditions_cache 또는 TTL 만료 시점까지 늦게 반영될 수 있습니다.
+        """
+        version = tuple(db.execute(_CONDITIONS_VERSION).one())
+        with self._conditions_lock:
+            if (
+                time.monotonic() < self._conditions_cache_expiry
+                and version == self._conditions_cache_version
+                and all(sid in self._conditions_cache for sid in stock_ids)
+            ):
+                return self._conditions_cache
+
+            self._conditions_cache = self._load_conditions(db, stock_ids)
+            self._conditions_cache_version = version
+            self._conditions_cache_expiry = time.monotonic() + self.CONDITIONS_CACHE_TTL
+            return self._conditions_cache
+
+    def invalidate_conditions_cache(self) -> None:
+        """알림 조건 캐시를 무효화합니다 (다음 체크 시 DB에서 재적재)."""
+        with self._conditions_lock:
+            self._conditions_cache_expiry = 0.0
+
+    def _record_alert(self, stock_id: int, alert_type: str,
+                      trigger_price: Optional[float], message: str,
+                      now: Optional[datetime] = None) -> AlertHistory:
+        """AlertHistory 객체 생성 (세션에는 추가하지 않음 — 호출자가 add/add_all)"""
+        return AlertHistory(
             stock_id=stock_id,
             alert_type=alert_type,
             trigger_price=trigger_price,
-            triggered_at=self._now(),
+            triggered_at=now or self._now(),
             message=message,
             is_sent=False,
         )
-        db.add(ah)
-        return ah
 
     def _fire_alert(
         self,
@@ -102,7 +219,10 @@ class AlertManager:
         current_price: float,
         threshold: float,
         extra: Optional[dict] = None,
-        orm_alert: Optional[PriceAlert] = None,
+        alert_id: Optional[int] = None,
+        last_fired: Optional[dict] = None,
+        now: Optional[datetime] = None,
+        new_histories: Optional[list] = None,
     ) -> Optional[dict]:
         """쿨다운 체크 → AlertHistory 저장 → 결과 dict 반환.
 
@@ -116,24 +236,42 @@ class AlertManager:
             current_price: 평가 시점의 현재가 또는 종가.
             threshold    : 초과된 임계값.
             extra        : 결과 dict에 병합할 추가 키 (거래량 관련 필드 등).
-            orm_alert    : 실제 PriceAlert 레코드가 있을 경우 전달하여
+            alert_id     : 실제 PriceAlert 레코드가 있을 경우 그 id를 전달하여
                            last_triggered_at 갱신에 사용.
+            last_fired   : _load_last_fired 결과. 체크 메서드가 틱마다 1회 조회해
+                           전달하며, 발화 시 같은 틱의 중복 발화를 막도록 갱신됨.
+                           None이면 직접 조회.
+            now          : 체크 메서드가 틱 시작 시 1회 계산한 기준 시각.
+                           None이면 self._now() 사용.
+            new_histories: 생성된 AlertHistory를 모아 둘 리스트. 체크 메서드가
+                           루프 종료 후 db.add_all로 한 번에 저장. None이면 즉시 db.add.
 
         Returns:
             발화 성공 시 결과 dict, 쿨다운으로 억제된 경우 None.
         """
-        if self._is_in_cooldown(db, stock.id, alert_type):
+        if now is None:
+            now = self._now()
+        if last_fired is None:
+            last_fired = self._load_last_fired(db, now)
+        if self._is_in_cooldown(last_fired, stock.id, alert_type, now):
             return None
 
         msg = (
             f"[{alert_type}] {stock.ticker} ({stock.name}) "
             f"현재가 ${current_price:.2f} / 기준 ${threshold:.2f}"
         )
-        ah = self._record_alert(db, stock.id, alert_type, current_price, msg)
+        ah = self._record_alert(stock.id, alert_type, current_price, msg, now)
         ah.is_sent = True
-
-        if orm_alert is not None and getattr(orm_alert, "id", None):
-            orm_alert.last_triggered_at = self._now()
+        if new_histories is not None:
+            new_histories.append(ah)
+        else:
+            db.add(ah)
+        last_fired[(stock.id, alert_type)] = now
+
+        if alert_id:
+            db.query(PriceAlert).filter(PriceAlert.id == alert_id).update(
+                {PriceAlert.last_triggered_at: now}, synchronize_session=False
+            )
 
         result = {
             "ticker": stock.ticker,
@@ -160,122 +298,132 @@ class AlertManager:
             발화된 알림 목록 [{"ticker", "name", "alert_type", "threshold", "current_price", "message"}]
         """
         triggered = []
+        now = self._now()
 
         with get_db() as db:
             holdings = (
-                db.query(PortfolioHolding, Stock)
-                .join(Stock, PortfolioHolding.stock_id == Stock.id)
+                db.query(PortfolioHolding)
+                .options(joinedload(PortfolioHolding.stock))
                 .all()
             )
-
-            for holding, stock in holdings:
-                current_price = holding.current_price
-                if current_price is None:
-                    continue
-
-                # 실제 PriceAlert ORM 레코드 조회
-                orm_alerts: list[PriceAlert] = (
-                    db.query(PriceAlert)
-                    .filter(
-                        and_(
-                            PriceAlert.stock_id == stock.id,
-                            PriceAlert.is_active == True,
-                        )
+            if not holdings:
+                return triggered
+
+            # ── 보유 종목 전체에 대한 일괄 조회 (종목당 쿼리 → 유형당 1회) ──
+            stock_ids = [holding.stock_id for holding in holdings]
+
+            conditions = self._get_conditions(db, stock_ids)
+            last_fired = self._load_last_fired(db, now)
+            new_histories: list[AlertHistory] = []
+            atr_by_stock: dict[int, Optional[float]] = {
+                sid: ind.atr_14
+                for sid, ind in self._latest_by_stock(
+                    db, TechnicalIndicator, TechnicalIndicator.date,
+                    TechnicalIndicator.stock_id.in_(stock_ids),
+                ).items()
+            }
+
+            # 보유 종목별 매수일(first_bought_at) 이후 일봉 최고가 → high_watermark
+            high_watermarks: dict[int, float] = dict(
+                db.query(PriceHistory.stock_id, func.max(PriceHistory.high))
+                .join(PortfolioHolding, PortfolioHolding.stock_id == PriceHistory.stock_id)
+                .filter(
+                    and_(
+                        PriceHistory.stock_id.in_(stock_ids),
+                        PriceHistory.interval == "1d",
+                        PriceHistory.timestamp >= PortfolioHolding.first_bought_at,
                     )
-                    .all()
                 )
+                .group_by(PriceHistory.stock_id)
+                .all()
+            )
 
-                # (condition, orm_alert_or_None) 쌍 목록 구성
-                candidates: list[tuple] = [(a, a) for a in orm_alerts]
-
-                # fallback: 최신 AI 추천의 stop_loss / target_price
-                if not candidates:
-                    latest_rec = (
-                        db.query(AIRecommendation)
-                        .filter(AIRecommendation.stock_id == stock.id)
-                        .order_by(desc(AIRecommendation.recommendation_date))
-                        .first()
-                    )
-                    if latest_rec:
-                        if latest_rec.stop_loss:
-                            candidates.append(
-                                (_AlertCondition("STOP_LOSS", latest_rec.stop_loss), None)
-                            )
-                        if latest_rec.target_price:
-                            candidates.append(
-                                (_AlertCondition("TARGET_PRICE", latest_rec.target_price), None)
-                            )
-
-                for condition, orm_alert in candidates:
-                    fired = False
-                    if condition.alert_type == "STOP_LOSS" and current_price <= condition.threshold_value:
-                        fired = True
-                    elif condition.alert_type == "TARGET_PRICE" and current_price >= condition.threshold_value:
-                        fired = True
-
-                    if not fired:
-                        continue
+            # (stock, current_price, condition, price_alert_id_or_None) 평탄화
+            # 조건은 PriceAlert 또는 AI 추천 fallback. 현재가 없는 보유 종목은 제외.
+            flat = [
+                (holding.stock, holding.current_price, condition, alert_id)
+                for holding in holdings
+                if holding.current_price is not None
+                for condition, alert_id in conditions.get(holding.stock_id, ())
+            ]
+            if flat:
+                # 발화 가능한 조건만 NumPy 마스크로 골라낸 뒤 해당 행만 Python에서 처리
+                n = len(flat)
+                prices = np.fromiter((row[1] for row in flat), dtype=np.float64, count=n)
+                thresholds = np.fromiter(
+                    (row[2].threshold_value for row in flat), dtype=np.float64, count=n
+                )
+                type_codes = np.fromiter(
+                    (_PRICE_ALERT_CODES.get(row[2].alert_type, -1) for row in flat),
+                    dtype=np.int8, count=n,
+                )
+                hit_mask = (
+                    ((type_codes == _STOP_LOSS_CODE) & (prices <= thresholds))
+                    | ((type_codes == _TARGET_PRICE_CODE) & (prices >= thresholds))
+                )
 
+                for i in np.flatnonzero(hit_mask).tolist():
+                    stock, current_price, condition, alert_id = flat[i]
                     result = self._fire_alert(
                         db, stock, condition.alert_type,
                         current_price, condition.threshold_value,
-                        orm_alert=orm_alert,
+                        alert_id=alert_id,
+                        last_fired=last_fired,
+                        now=now,
+                        new_histories=new_histories,
                     )
                     if result is not None:
                         triggered.append(result)
 
-                # ── 트레일링 스톱 체크 (DB 변경 없이 코드 내 처리) ──
-                # buy_date 이후 PriceHistory의 max(high)를 high_watermark로 사용
-                buy_date = getattr(holding, "first_bought_at", None)
-                if buy_date is None:
-                    buy_date = getattr(holding, "created_at", None)
-
-                if buy_date is not None and current_price is not None:
-                    from sqlalchemy import func
-                    high_watermark_row = (
-                        db.query(func.max(PriceHistory.high))
-                        .filter(
-                            and_(
-                                PriceHistory.stock_id == stock.id,
-                                PriceHistory.interval == "1d",
-                                PriceHistory.timestamp >= buy_date,
-                            )
-                        )
-                        .scalar()
+            # ── 트레일링 스톱 체크 (DB 변경 없이 코드 내 처리) ──
+            # buy_date 이후 PriceHistory의 max(high)를 high_watermark로 사용하고,
+            # 보유 종목 전체의 하락률/ATR 기반 기준을 NumPy 배열로 한 번에 계산
+            trailing = [
+                (holding.stock, holding.current_price, high_watermarks[holding.stock_id])
+                for holding in holdings
+                if holding.current_price is not None
+                and (high_watermarks.get(holding.stock_id) or 0) > 0
+            ]
+            if trailing:
+                n = len(trailing)
+                current_prices = np.fromiter((p for _, p, _ in trailing), dtype=np.float64, count=n)
+                high_marks = np.fromiter((h for _, _, h in trailing), dtype=np.float64, count=n)
+                atrs = np.fromiter(
+                    (atr_by_stock.get(stock.id) or np.nan for stock, _, _ in trailing),
+                    dtype=np.float64, count=n,
+                )
+
+                # ATR 기반 동적 트레일링 스톱 (5%~20% 범위, ATR 없으면 기본 10%)
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    atr_pct = np.clip(3 * atrs / current_prices, 0.05, 0.20)
+                dynamic_pct = np.where(
+                    (atrs > 0) & (current_prices > 0), atr_pct, self.TRAILING_STOP_PCT
+                )
+                drawdowns = (current_prices - high_marks) / high_marks
+
+                for i in np.flatnonzero(drawdowns <= -dynamic_pct).tolist():
+                    stock, current_price, high_watermark = trailing[i]
+                    drawdown = float(drawdowns[i])
+                    result = self._fire_alert(
+                        db, stock, "TRAILING_STOP",
+                        current_price, high_watermark,
+                        extra={
+                            "high_watermark": round(high_watermark, 2),
+                            "drawdown_pct": round(drawdown * 100, 2),
+                        },
+                        last_fired=last_fired,
+                        now=now,
+                        new_histories=new_histories,
                     )
+                    if result is not None:
+                        result["message"] = (
+                            f"[TRAILING_STOP] {stock.ticker} ({stock.name}) "
+                            f"현재가 ${current_price:.2f} / 최고가 ${high_watermark:.2f} "
+                            f"(하락률 {drawdown * 100:.1f}%)"
+                        )
+                        triggered.append(result)
 
-                    if high_watermark_row and high_watermark_row > 0:
-                        # ATR 기반 동적 트레일링 스톱 계산
-                        dynamic_pct = self.TRAILING_STOP_PCT  # 기본값 10%
-                        try:
-                            stock_for_atr = db.query(Stock).filter(Stock.ticker == stock.ticker).first()
-                            if stock_for_atr:
-                                ind_for_atr = db.query(TechnicalIndicator).filter(
-                                    TechnicalIndicator.stock_id == stock_for_atr.id
-                                ).order_by(TechnicalIndicator.date.desc()).first()
-                                if ind_for_atr and hasattr(ind_for_atr, 'atr_14') and ind_for_atr.atr_14 and current_price > 0:
-                                    dynamic_pct = (3 * ind_for_atr.atr_14) / current_price
-                                    dynamic_pct = max(0.05, min(0.20, dynamic_pct))  # 5%~20% 범위
-                        except Exception:
-                            pass  # 실패시 기본 10% 사용
-
-                        drawdown = (current_price - high_watermark_row) / high_watermark_row
-                        if drawdown <= -dynamic_pct:
-                            result = self._fire_alert(
-                                db, stock, "TRAILING_STOP",
-                                current_price, high_watermark_row,
-                                extra={
-                                    "high_watermark": round(high_watermark_row, 2),
-                                    "drawdown_pct": round(drawdown * 100, 2),
-                                },
-                            )
-                            if result is not None:
-                                result["message"] = (
-                                    f"[TRAILING_STOP] {stock.ticker} ({stock.name}) "
-                                    f"현재가 ${current_price:.2f} / 최고가 ${high_watermark_row:.2f} "
-                                    f"(하락률 {drawdown * 100:.1f}%)"
-                                )
-                                triggered.append(result)
+            db.add_all(new_histories)
 
         return triggered
 
@@ -290,32 +438,35 @@ class AlertManager:
             발화된 종목 목록
         """
         triggered = []
-        today = self._now().date()
+        now = self._now()
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow_start = today_start + timedelta(days=1)
 
         with get_db() as db:
-            stocks = db.query(Stock).filter(Stock.is_active == True).all()
+            active_ids = select(Stock.id).where(Stock.is_active)
+
+            # 오늘 일봉이 있는 활성 종목의 최신 일봉 / 최신 지표를 각각 1회 쿼리로 조회
+            latest_prices = self._latest_by_stock(
+                db, PriceHistory, PriceHistory.timestamp,
+                PriceHistory.stock_id.in_(active_ids),
+                PriceHistory.interval == "1d",
+                PriceHistory.timestamp >= today_start,
+                PriceHistory.timestamp < tomorrow_start,
+            )
+            if not latest_prices:
+                return triggered
+            stock_ids = list(latest_prices)
+            latest_inds = self._latest_by_stock(
+                db, TechnicalIndicator, TechnicalIndicator.date,
+                TechnicalIndicator.stock_id.in_(stock_ids),
+            )
+            stocks = db.query(Stock).filter(Stock.id.in_(stock_ids)).order_by(Stock.id).all()
+            last_fired = self._load_last_fired(db, now)
+            new_histories: list[AlertHistory] = []
 
             for stock in stocks:
-                price_row = (
-                    db.query(PriceHistory)
-                    .filter(
-                        and_(
-                            PriceHistory.stock_id == stock.id,
-                            PriceHistory.interval == "1d",
-                        )
-                    )
-                    .order_by(desc(PriceHistory.timestamp))
-                    .first()
-                )
-                if price_row is None or price_row.timestamp.date() != today:
-                    continue
-
-                indicator = (
-                    db.query(TechnicalIndicator)
-                    .filter(TechnicalIndicator.stock_id == stock.id)
-                    .order_by(desc(TechnicalIndicator.date))
-                    .first()
-                )
+                price_row = latest_prices[stock.id]
+                indicator = latest_inds.get(stock.id)
                 if indicator is None or not indicator.volume_ma_20:
                     continue
 
@@ -333,6 +484,9 @@ class AlertManager:
                         "volume_ma20": indicator.volume_ma_20,
                         "ratio": round(ratio, 2),
                     },
+                    last_fired=last_fired,
+                    now=now,
+                    new_histories=new_histories,
                 )
                 if result is not None:
                     result["message"] = (
@@ -341,6 +495,8 @@ class AlertManager:
                     )
                     triggered.append(result)
 
+            db.add_all(new_histories)
+
         return triggered
 
     def check_and_notify(self) -> bool:
@@ -351,9 +507,11 @@ class AlertManager:
         Returns:
             카카오 전송 성공 여부 (미설정 시 True)
         """
-        portfolio_alerts = self.check_portfolio_alerts()
-        volume_alerts = self.check_volume_surge()
-        all_alerts = portfolio_alerts + volume_alerts
+        # 두 체크는 각자 세션을 여는 독립적인 I/O 작업이므로 동시에 실행해 DB 대기를 겹침
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            portfolio_future = executor.submit(self.check_portfolio_alerts)
+            volume_future = executor.submit(self.check_volume_surge)
+            all_alerts = portfolio_future.result() + volume_future.result()
 
         if not all_alerts:
             logger.debug("[알림 매니저] 발화 조건 없음")
@@ -361,16 +519,8 @@ class AlertManager:
 
         logger.info(f"[알림 매니저] {len(all_alerts)}건 알림 발화")
 
-        try:
-            from notifications.kakao import kakao_notifier
-            kakao_notifier.send_price_alerts(all_alerts)
-        except Exception as e:
-            logger.debug(f"[알림 매니저] 카카오 전송 스킵: {e}")
-        try:
-            from notifications.telegram import telegram_notifier
-            telegram_notifier.send_price_alerts(all_alerts)
-        except Exception as e:
-            logger.debug(f"[알림 매니저] 텔레그램 전송 스킵: {e}")
+        # 카카오/텔레그램은 서로 독립적인 HTTP 호출이므로 동시에 발송
+        dispatch(alerts=all_alerts)
         return True
 
     def get_alert_history(self, days: int = 7) -> list[dict]:
@@ -383,25 +533,33 @@ class AlertManager:
         since = self._now() - timedelta(days=days)
 
         with get_db() as db:
-            rows = (
-                db.query(AlertHistory, Stock.ticker, Stock.name)
+            # 읽기 전용 투영이므로 ORM 인스턴스 대신 컬럼 Row만 조회
+            rows = db.execute(
+                select(
+                    Stock.ticker,
+                    Stock.name,
+                    AlertHistory.alert_type,
+                    AlertHistory.trigger_price,
+                    AlertHistory.triggered_at,
+                    AlertHistory.message,
+                    AlertHistory.is_sent,
+                )
                 .join(Stock, AlertHistory.stock_id == Stock.id)
-                .filter(AlertHistory.triggered_at >= since)
+                .where(AlertHistory.triggered_at >= since)
                 .order_by(desc(AlertHistory.triggered_at))
-                .all()
-            )
+            ).all()
 
             return [
                 {
-                    "ticker": ticker,
-                    "name": name,
-                    "alert_type": ah.alert_type,
-                    "trigger_price": ah.trigger_price,
-                    "triggered_at": ah.triggered_at.strftime("%Y-%m-%d %H:%M"),
-                    "message": ah.message,
-                    "is_sent": ah.is_sent,
+                    "ticker": row.ticker,
+                    "name": row.name,
+                    "alert_type": row.alert_type,
+                    "trigger_price": row.trigger_price,
+                    "triggered_at": row.triggered_at.strftime("%Y-%m-%d %H:%M"),
+                    "message": row.message,
+                    "is_sent": row.is_sent,
                 }
-                for ah, ticker, name in rows
+                for row in rows
             ]
 
     def set_alert(self, ticker: str, alert_type: str, threshold_value: float) -> bool:
@@ -451,6 +609,7 @@ class AlertManager:
                     ))
                     logger.info(f"[알림 설정] {ticker} {alert_type} 신규 등록 @ {threshold_value}")
 
+            self.invalidate_conditions_cache()
             return True
         except Exception as e:
             logger.error(f"[알림 설정] 실패: {e}")
@@ -474,27 +633,32 @@ class AlertManager:
             ticker 오름차순 정렬
         """
         with get_db() as db:
-            rows = (
-                db.query(PriceAlert, Stock.ticker, Stock.name)
+            rows = db.execute(
+                select(
+                    Stock.ticker,
+                    Stock.name,
+                    PriceAlert.alert_type,
+                    PriceAlert.threshold_value,
+                    PriceAlert.last_triggered_at,
+                )
                 .join(Stock, PriceAlert.stock_id == Stock.id)
-                .filter(PriceAlert.is_active == True)
+                .where(PriceAlert.is_active)
                 .order_by(Stock.ticker.asc())
-                .all()
-            )
+            ).all()
 
             return [
                 {
-                    "ticker": ticker,
-                    "name": name,
-                    "alert_type": alert.alert_type,
-                    "threshold_value": alert.threshold_value,
+                    "ticker": row.ticker,
+                    "name": row.name,
+                    "alert_type": row.alert_type,
+                    "threshold_value": row.threshold_value,
                     "last_triggered_at": (
-                        alert.last_triggered_at.strftime("%Y-%m-%d %H:%M")
-                        if alert.last_triggered_at is not None
+                        row.last_triggered_at.strftime("%Y-%m-%d %H:%M")
+                        if row.last_triggered_at is not None
                         else None
                     ),
                 }
-                for alert, ticker, name in rows
+                for row in rows
             ]
 
 
@@ -0,0 +1,94 @@
+"""
+알림 일괄 발송 모듈
+설정된 모든 채널(카카오/텔레그램)의 send_* 호출을 스레드 풀에서 동시에 실행합니다.
+
+각 호출은 서로 독립적인 HTTPS 요청(I/O 대기)이므로 직렬 호출 시
+채널 수 × 메시지 종류 × RTT 였던 대기 시간이 약 1 × RTT 로 줄어듭니다.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Optional
+
+from loguru import logger
+
+__all__ = ["dispatch"]
+
+MAX_WORKERS = 8
+
+
+def _load_channels() -> list[tuple[str, object]]:
+    """사용 가능한 알림 채널을 모듈 로드 시 1회만 import"""
+    channels = []
+    try:
+        from notifications.kakao import kakao_notifier
+        channels.append(("카카오", kakao_notifier))
+    except Exception as e:
+        logger.debug(f"[알림 발송] 카카오 모듈 로드 실패: {e}")
+    try:
+        from notifications.telegram import telegram_notifier
+        channels.append(("텔레그램", telegram_notifier))
+    except Exception as e:
+        logger.debug(f"[알림 발송] 텔레그램 모듈 로드 실패: {e}")
+    return channels
+
+
+_CHANNELS = _load_channels()
+
+
+def dispatch(
+    recommendations: Optional[list[dict]] = None,
+    sell_signals: Optional[list[dict]] = None,
+    alerts: Optional[list[dict]] = None,
+    daily_summary: Optional[dict] = None,
+) -> dict[str, bool]:
+    """
+    전달된 알림을 모든 채널로 동시에 발송합니다.
+    비어 있는 항목은 발송하지 않으며, 채널 오류는 로그만 남기고 무시합니다(graceful).
+
+    daily_summary에는 호출자가 1회 계산한 portfolio_manager.get_summary() 결과를 넘깁니다.
+    채널마다 요약을 따로 계산하면 시세 조회와 평가값 기록이 채널 수만큼 중복되기 때문입니다.
+    2종 이상을 함께 넘기면 send_digest를 제공하는 채널에는 섹션을 묶은 메시지 1건만 보냅니다.
+
+    Returns:
+        {"카카오.send_buy_recommendations": True, ...} 형태의 호출별 성공 여부
+    """
+    calls = []
+    if recommendations:
+        calls.append(("send_buy_recommendations", (recommendations,)))
+    if sell_signals:
+        calls.append(("send_sell_signals", (sell_signals,)))
+    if alerts:
+        calls.append(("send_price_alerts", (alerts,)))
+    if daily_summary:
+        calls.append(("send_daily_summary", (daily_summary,)))
+
+    # 2종 이상을 함께 보내면 다이제스트를 지원하는 채널(텔레그램)은 메시지 1건으로 묶어 전송
+    tasks = []
+    for label, notifier in _CHANNELS:
+        if len(calls) > 1 and hasattr(notifier, "send_digest"):
+            tasks.append((
+                f"{label}.send_digest",
+                partial(
+                    notifier.send_digest,
+                    buys=recommendations, sells=sell_signals, alerts=alerts, summary=daily_summary,
+                ),
+                (),
+            ))
+        else:
+            tasks.extend(
+                (f"{label}.{method}", getattr(notifier, method), args) for method, args in calls
+            )
+    if not tasks:
+        return {}
+
+    results: dict[str, bool] = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(tasks))) as executor:
+        futures = {executor.submit(fn, *args): key for key, fn, args in tasks}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = bool(future.result())
+            except Exception as e:
+                logger.debug(f"[알림 발송] {key} 스킵: {e}")
+                results[key] = False
+    return results
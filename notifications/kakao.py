@@ -10,27 +10,146 @@
   4. 리다이렉트 URL에서 code 파라미터 추출
   5. curl 또는 requests로 access_token + refresh_token 교환
   6. .env에 KAKAO_ACCESS_TOKEN, KAKAO_REFRESH_TOKEN 저장
+
+갱신된 토큰은 KAKAO_TOKEN_CACHE 파일에 저장되어 재시작 시 복원됩니다.
+.env에 토큰을 재발급해 넣으면 이전 .env 토큰에서 파생된 캐시는 자동으로 무시됩니다.
 """
+import hashlib
 import json
+import os
+import threading
+import time
+from typing import Optional
 
-import requests
 from loguru import logger
 
 from config.settings import settings
+from notifications._common import (
+    ALERT_ICON,
+    BUY_ACTIONS,
+    HTTP_CLIENT,
+    SELL_SIGNALS,
+    URGENCY_ICON,
+    order_by_urgency,
+)
+
+try:
+    import orjson  # 선택 의존성: 없으면 표준 json으로 대체
+except ImportError:
+    orjson = None
 
 KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
 KAKAO_SEND_URL = "https://kapi.kakao.com/v2/api/talk/memo/default/send"
+TOKEN_REFRESH_MARGIN = 60  # 만료 N초 전에 미리 갱신
+
+# 항목 단위 문구 포맷 (미리 바인딩한 format_map에 항목별 dict만 넘김)
+_BUY_TITLE = "{icon} {ticker} ({conf}%)".format_map
+_BUY_DESC = "{name} | {price}".format_map
+_SELL_TITLE = "{urgency_icon}{signal_icon} {ticker} ({pnl:+.1f}%)".format_map
+_ALERT_TITLE = "{icon} {ticker} — {alert_type}".format_map
+_ALERT_DESC = "현재가 {price} / 기준 {threshold}".format_map
+_HOLDING_TEXT = "{ticker}: {sign}{pnl_pct:.1f}%".format_map
+
+
+def _token_fingerprint(token: str) -> str:
+    """캐시 파일에 원문 대신 기록하는 .env Refresh Token 식별값 (SHA-256)"""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _dumps_template(template: dict) -> str:
+    """템플릿 dict를 compact UTF-8 JSON 문자열로 직렬화 (orjson 우선)"""
+    if orjson is not None:
+        return orjson.dumps(template).decode()
+    return json.dumps(template, ensure_ascii=False, separators=(",", ":"))
 
 
 class KakaoNotifier:
     """카카오톡 나에게 보내기 알림 전송"""
 
+    def __init__(self):
+        # Access Token 만료 시각 (time.monotonic 기준, 갱신 여유분 차감).
+        # None이면 만료 시각을 모르는 상태 → 401 발생 시에만 갱신
+        self._token_expiry: Optional[float] = None
+        # (토큰, 헤더) — 토큰이 바뀌지 않는 한 같은 헤더 dict 재사용
+        self._headers_cache: tuple[Optional[str], Optional[dict]] = (None, None)
+        # dispatch()가 여러 메시지를 동시에 보내므로 토큰 갱신은 한 스레드만 수행
+        # (Refresh Token이 회전되면 중복 갱신 요청은 이전 토큰으로 실패할 수 있음)
+        self._refresh_lock = threading.Lock()
+        # 캐시가 어느 .env 토큰에서 파생됐는지 구분하는 값 (캐시 복원으로 settings가 바뀌기 전에 계산)
+        self._env_fingerprint = _token_fingerprint(settings.KAKAO_REFRESH_TOKEN)
+        self._load_token_cache()
+
+    def _load_token_cache(self) -> None:
+        """캐시 파일에 저장된 토큰을 settings에 반영합니다.
+
+        Refresh Token은 카카오가 갱신 시 회전시킨 최신 값일 수 있으므로 항상 복원하고,
+        Access Token 만료 여부는 _token_expiry에만 반영합니다 (만료 시 첫 전송 전에 갱신).
+        캐시를 만든 당시의 .env Refresh Token과 현재 .env 값이 다르면(토큰 재발급) 캐시를 무시합니다.
+        """
+        try:
+            with open(settings.KAKAO_TOKEN_CACHE, encoding="utf-8") as f:
+                cached = json.load(f)
+            access_token = cached["access_token"]
+            expires_at = float(cached["expires_at"])
+            refresh_token = cached.get("refresh_token")
+            env_fingerprint = cached.get("env_refresh_sha256")
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"[카카오] 토큰 캐시 파일 무시: {e}")
+            return
+
+        if env_fingerprint != self._env_fingerprint:
+            logger.info("[카카오] .env 토큰이 캐시 생성 이후 변경됨 — 토큰 캐시 무시, .env 토큰 사용")
+            return
+
+        if refresh_token:
+            settings.KAKAO_REFRESH_TOKEN = refresh_token
+        settings.KAKAO_ACCESS_TOKEN = access_token
+
+        remaining = expires_at - time.time()
+        if remaining <= TOKEN_REFRESH_MARGIN:
+            # 만료(임박) 토큰 → 지금을 만료 시각으로 두어 첫 전송 전에 갱신
+            self._token_expiry = time.monotonic()
+            logger.debug("[카카오] 캐시된 Access Token 만료 — 첫 전송 시 갱신")
+            return
+
+        # 파일에는 벽시계 기준으로 저장 → 프로세스 내부 monotonic 기준으로 변환
+        self._token_expiry = time.monotonic() + remaining - TOKEN_REFRESH_MARGIN
+        logger.debug(f"[카카오] 캐시된 Access Token 사용 (남은 시간 {int(remaining)}초)")
+
+    def _save_token_cache(self, access_token: str, refresh_token: str, expires_in: int) -> bool:
+        """갱신된 토큰을 캐시 파일에 원자적으로 기록합니다 (소유자만 읽기/쓰기)."""
+        path = settings.KAKAO_TOKEN_CACHE
+        tmp_path = path.with_name(path.name + ".tmp")
+        payload = {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_at": time.time() + expires_in,
+            "env_refresh_sha256": self._env_fingerprint,
+        }
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, path)
+            os.chmod(path, 0o600)
+        except OSError as e:
+            logger.warning(f"[카카오] 토큰 캐시 저장 실패: {e}")
+            return False
+        return True
+
     def _is_configured(self) -> bool:
         """카카오 설정 여부 확인"""
         return bool(settings.KAKAO_ACCESS_TOKEN)
 
-    def _get_headers(self) -> dict:
-        return {"Authorization": f"Bearer {settings.KAKAO_ACCESS_TOKEN}"}
+    def _get_headers(self, token: str) -> dict:
+        # 튜플을 한 번에 읽고 써서, 다른 스레드가 캐시를 비워도 None을 반환하지 않음
+        cached_token, headers = self._headers_cache
+        if cached_token != token:
+            headers = {"Authorization": f"Bearer {token}"}
+            self._headers_cache = (token, headers)
+        return headers
 
     def _refresh_access_token(self) -> bool:
         """Refresh Token으로 Access Token을 갱신합니다."""
@@ -42,7 +161,7 @@ class KakaoNotifier:
             return False
 
         try:
-            resp = requests.post(
+            resp = HTTP_CLIENT.post(
                 KAKAO_TOKEN_URL,
                 data={
                     "grant_type": "refresh_token",
@@ -60,34 +179,60 @@ class KakaoNotifier:
 
             # 런타임에서 settings 값 업데이트 (재시작 전까지 유효)
             settings.KAKAO_ACCESS_TOKEN = new_token
+            self._headers_cache = (None, None)
+            expires_in = int(token_data.get("expires_in", 21599))
+            self._token_expiry = time.monotonic() + expires_in - TOKEN_REFRESH_MARGIN
             if token_data.get("refresh_token"):
                 settings.KAKAO_REFRESH_TOKEN = token_data["refresh_token"]
-
-            logger.info("[카카오] Access Token 갱신 완료. .env 파일을 업데이트하세요.")
-            logger.info(f"  새 Access Token: {new_token[:20]}...")
+            if self._save_token_cache(new_token, settings.KAKAO_REFRESH_TOKEN, expires_in):
+                logger.info(f"[카카오] Access Token 갱신 완료 — 토큰 캐시 파일에 저장 ({settings.KAKAO_TOKEN_CACHE})")
+            else:
+                logger.info("[카카오] Access Token 갱신 완료 (캐시 저장 실패 — 재시작 시 다시 갱신)")
             return True
 
         except Exception as e:
             logger.error(f"[카카오] 토큰 갱신 요청 실패: {e}")
             return False
 
+    def _token_expiring(self) -> bool:
+        """만료 시각을 알고 있고 갱신 여유분 이내로 남았으면 True"""
+        return self._token_expiry is not None and time.monotonic() >= self._token_expiry
+
     def _send_message(self, template: dict, retry: bool = True) -> bool:
-        """카카오 메시지를 전송합니다. 401 시 자동으로 토큰 갱신 후 재시도."""
+        """카카오 메시지를 전송합니다.
+
+        토큰 만료가 임박하면 전송 전에 미리 갱신하고,
+        그래도 401이 발생하면 토큰 갱신 후 1회 재시도합니다.
+        """
         if not self._is_configured():
             logger.debug("[카카오] KAKAO_ACCESS_TOKEN 미설정, 알림 스킵")
             return False
 
+        if self._token_expiring():
+            with self._refresh_lock:
+                # 락을 기다리는 동안 다른 스레드가 갱신했으면 다시 갱신하지 않음
+                if self._token_expiring():
+                    logger.info("[카카오] Access Token 만료 임박 — 사전 갱신")
+                    self._refresh_access_token()
+
+        token = settings.KAKAO_ACCESS_TOKEN
         try:
-            resp = requests.post(
+            resp = HTTP_CLIENT.post(
                 KAKAO_SEND_URL,
-                headers=self._get_headers(),
-                data={"template_object": json.dumps(template)},
+                headers=self._get_headers(token),
+                data={"template_object": _dumps_template(template)},
                 timeout=10,
             )
 
             if resp.status_code == 401 and retry:
-                logger.warning("[카카오] 401 Unauthorized — 토큰 갱신 시도")
-                if self._refresh_access_token():
+                with self._refresh_lock:
+                    # 이 요청에 쓴 토큰이 이미 교체됐으면 갱신 없이 새 토큰으로 재시도
+                    if settings.KAKAO_ACCESS_TOKEN != token:
+                        refreshed = True
+                    else:
+                        logger.warning("[카카오] 401 Unauthorized — 토큰 갱신 시도")
+                        refreshed = self._refresh_access_token()
+                if refreshed:
                     return self._send_message(template, retry=False)
                 return False
 
@@ -111,13 +256,14 @@ class KakaoNotifier:
         """매수 추천 ListTemplate을 생성합니다."""
         items = []
         for r in recommendations[:5]:  # 최대 5건
-            action_icon = "🟢🟢" if r["action"] == "STRONG_BUY" else "🟢"
-            confidence_pct = int(r["confidence"] * 100)
-            price_str = f"${r['price_at_recommendation']:.2f}" if r.get("price_at_recommendation") else "N/A"
-            items.append({
-                "title": f"{action_icon} {r['ticker']} ({confidence_pct}%)",
-                "description": f"{r['name']} | {price_str}",
-            })
+            fields = {
+                "icon": "🟢🟢" if r["action"] == "STRONG_BUY" else "🟢",
+                "ticker": r["ticker"],
+                "conf": int(r["confidence"] * 100),
+                "name": r["name"],
+                "price": f"${r['price_at_recommendation']:.2f}" if r.get("price_at_recommendation") else "N/A",
+            }
+            items.append({"title": _BUY_TITLE(fields), "description": _BUY_DESC(fields)})
 
         count = len(recommendations)
         return {
@@ -130,16 +276,17 @@ class KakaoNotifier:
 
     def _build_sell_signal_template(self, sell_signals: list[dict]) -> dict:
         """매도 신호 ListTemplate을 생성합니다. urgency=HIGH 우선."""
-        urgency_order = {"HIGH": 0, "NORMAL": 1, "LOW": 2}
-        sorted_signals = sorted(sell_signals, key=lambda x: urgency_order.get(x.get("urgency", "LOW"), 2))
+        sorted_signals = order_by_urgency(sell_signals)
 
         items = []
         for s in sorted_signals[:5]:
-            urgency_icon = {"HIGH": "🔴", "NORMAL": "🟠", "LOW": "🟡"}.get(s.get("urgency", "NORMAL"), "🟡")
-            signal_icon = "📉📉" if s["signal"] == "STRONG_SELL" else "📉"
-            pnl_pct = s.get("current_pnl_pct", 0) or 0
             items.append({
-                "title": f"{urgency_icon}{signal_icon} {s['ticker']} ({pnl_pct:+.1f}%)",
+                "title": _SELL_TITLE({
+                    "urgency_icon": URGENCY_ICON.get(s.get("urgency", "NORMAL"), "🟡"),
+                    "signal_icon": "📉📉" if s["signal"] == "STRONG_SELL" else "📉",
+                    "ticker": s["ticker"],
+                    "pnl": s.get("current_pnl_pct", 0) or 0,
+                }),
                 "description": s.get("reasoning", "")[:60],
             })
 
@@ -159,10 +306,14 @@ class KakaoNotifier:
         pnl_icon = "📈" if total_pnl >= 0 else "📉"
         pnl_sign = "+" if total_pnl >= 0 else ""
 
-        top_holdings = []
-        for h in summary.get("holdings", [])[:3]:
-            sign = "+" if h["unrealized_pnl_pct"] >= 0 else ""
-            top_holdings.append(f"{h['ticker']}: {sign}{h['unrealized_pnl_pct']:.1f}%")
+        top_holdings = [
+            _HOLDING_TEXT({
+                "ticker": h["ticker"],
+                "sign": "+" if h["unrealized_pnl_pct"] >= 0 else "",
+                "pnl_pct": h["unrealized_pnl_pct"],
+            })
+            for h in summary.get("holdings", [])[:3]
+        ]
         holdings_str = " | ".join(top_holdings) if top_holdings else "보유 없음"
 
         return {
@@ -181,20 +332,16 @@ class KakaoNotifier:
 
     def _build_price_alert_template(self, alerts: list[dict]) -> dict:
         """가격 알림 ListTemplate을 생성합니다. 최대 5건."""
-        icon_map = {
-            "STOP_LOSS": "🔴",
-            "TARGET_PRICE": "🎯",
-            "VOLUME_SURGE": "📊",
-        }
         items = []
         for a in alerts[:5]:
-            icon = icon_map.get(a.get("alert_type", ""), "⚠️")
-            price_str = f"${a['current_price']:.2f}" if a.get("current_price") else "N/A"
-            threshold_str = f"${a['threshold']:.2f}" if a.get("threshold") else "N/A"
-            items.append({
-                "title": f"{icon} {a['ticker']} — {a.get('alert_type', '')}",
-                "description": f"현재가 {price_str} / 기준 {threshold_str}",
-            })
+            fields = {
+                "icon": ALERT_ICON.get(a.get("alert_type", ""), "⚠️"),
+                "ticker": a["ticker"],
+                "alert_type": a.get("alert_type", ""),
+                "price": f"${a['current_price']:.2f}" if a.get("current_price") else "N/A",
+                "threshold": f"${a['threshold']:.2f}" if a.get("threshold") else "N/A",
+            }
+            items.append({"title": _ALERT_TITLE(fields), "description": _ALERT_DESC(fields)})
 
         count = len(alerts)
         return {
@@ -221,7 +368,11 @@ class KakaoNotifier:
         BUY/STRONG_BUY 추천 목록을 카카오톡으로 전송합니다.
         추천이 없으면 전송하지 않습니다.
         """
-        buy_recs = [r for r in recommendations if r.get("action") in ("BUY", "STRONG_BUY")]
+        if not self._is_configured():
+            logger.debug("[카카오] KAKAO_ACCESS_TOKEN 미설정, 알림 스킵")
+            return True
+
+        buy_recs = [r for r in recommendations if r.get("action") in BUY_ACTIONS]
         if not buy_recs:
             logger.debug("[카카오] 매수 추천 없음, 알림 스킵")
             return True
@@ -237,7 +388,11 @@ class KakaoNotifier:
         SELL/STRONG_SELL 신호 목록을 카카오톡으로 전송합니다.
         신호가 없으면 전송하지 않습니다.
         """
-        active_signals = [s for s in sell_signals if s.get("signal") in ("SELL", "STRONG_SELL")]
+        if not self._is_configured():
+            logger.debug("[카카오] KAKAO_ACCESS_TOKEN 미설정, 알림 스킵")
+            return True
+
+        active_signals = [s for s in sell_signals if s.get("signal") in SELL_SIGNALS]
         if not active_signals:
             logger.debug("[카카오] 매도 신호 없음, 알림 스킵")
             return True
@@ -248,14 +403,24 @@ class KakaoNotifier:
             logger.info(f"[카카오] 매도 신호 알림 전송 완료 ({len(active_signals)}개)")
         return success
 
-    def send_daily_summary(self) -> bool:
-        """매일 장 마감 후 포트폴리오 요약을 카카오톡으로 전송합니다."""
-        from portfolio.portfolio_manager import portfolio_manager
-        try:
-            summary = portfolio_manager.get_summary()
-        except Exception as e:
-            logger.error(f"[카카오] 포트폴리오 조회 실패: {e}")
-            return False
+    def send_daily_summary(self, summary: Optional[dict] = None) -> bool:
+        """매일 장 마감 후 포트폴리오 요약을 카카오톡으로 전송합니다.
+
+        Args:
+            summary: portfolio_manager.get_summary() 결과. 여러 채널로 보낼 때 호출자가 1회만
+                     계산해 넘기며, 없으면 직접 조회 (단독 호출용)
+        """
+        if not self._is_configured():
+            logger.debug("[카카오] KAKAO_ACCESS_TOKEN 미설정, 알림 스킵")
+            return True
+
+        if summary is None:
+            from portfolio.portfolio_manager import portfolio_manager
+            try:
+                summary = portfolio_manager.get_summary()
+            except Exception as e:
+                logger.error(f"[카카오] 포트폴리오 조회 실패: {e}")
+                return False
 
         template = self._build_portfolio_summary_template(summary)
         success = self._send_message(template)
@@ -5,14 +5,31 @@
 설정:
   .env 파일에 TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID 추가
 """
+import random
 import time
+from typing import Optional
 
-import requests
+import httpx
 from loguru import logger
 
 from config.settings import settings
+from notifications._common import (
+    ALERT_ICON,
+    BUY_ACTIONS,
+    HTTP_CLIENT,
+    SELL_SIGNALS,
+    URGENCY_ICON,
+    order_by_urgency,
+)
 
 TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+MAX_BACKOFF_SECONDS = 30  # 한 메시지의 재시도 대기 총합 상한
+
+# 행 단위 메시지 포맷 (미리 바인딩한 format_map에 행별 dict만 넘김)
+_BUY_LINE = "{icon} *{ticker}* ({conf}%) | {price}".format_map
+_SELL_LINE = "{icon} *{ticker}* ({pnl:+.1f}%) | {reasoning}".format_map
+_ALERT_LINE = "{icon} *{ticker}* {alert_type} | 현재 {price}".format_map
+_HOLDING_LINE = "  {ticker}: {sign}{pnl_pct:.1f}%".format_map
 
 
 class TelegramNotifier:
@@ -27,9 +44,10 @@ class TelegramNotifier:
             logger.debug("[텔레그램] TELEGRAM_BOT_TOKEN 또는 CHAT_ID 미설정, 스킵")
             return False
 
+        waited = 0.0
         for attempt in range(3):
             try:
-                resp = requests.post(
+                resp = HTTP_CLIENT.post(
                     TELEGRAM_API_URL.format(token=settings.TELEGRAM_BOT_TOKEN),
                     json={
                         "chat_id": settings.TELEGRAM_CHAT_ID,
@@ -42,82 +60,133 @@ class TelegramNotifier:
                     return True
                 elif resp.status_code == 429:
                     retry_after = resp.json().get("parameters", {}).get("retry_after", 5)
-                    logger.warning(f"[텔레그램] Rate limit, {retry_after}초 후 재시도")
-                    time.sleep(retry_after)
+                    # 동시 발송된 메시지들이 같은 순간에 몰려 재시도하지 않도록 지터 추가
+                    delay = retry_after + random.uniform(0, 0.5)
+                    if waited + delay > MAX_BACKOFF_SECONDS:
+                        logger.error(f"[텔레그램] Rate limit 대기 상한({MAX_BACKOFF_SECONDS}초) 초과, 전송 포기")
+                        return False
+                    logger.warning(f"[텔레그램] Rate limit, {delay:.1f}초 후 재시도")
+                    time.sleep(delay)
+                    waited += delay
                     continue
                 else:
                     logger.error(f"[텔레그램] 전송 실패: {resp.status_code} {resp.text[:200]}")
                     return False
 
-            except requests.exceptions.RequestException as e:
+            except (httpx.HTTPError, ValueError) as e:
                 if attempt < 2:
                     logger.warning(f"[텔레그램] 네트워크 오류 (시도 {attempt+1}/3): {e}")
-                    time.sleep(2)
+                    delay = min(2 + random.uniform(0, 0.5), max(MAX_BACKOFF_SECONDS - waited, 0))
+                    time.sleep(delay)
+                    waited += delay
                 else:
                     logger.error(f"[텔레그램] 전송 최종 실패: {e}")
                     return False
         return False
 
+    # -- 메시지 포맷 (개별 전송과 다이제스트가 공유) --
+
+    @staticmethod
+    def _format_buy_lines(buy_recs: list[dict]) -> list[str]:
+        lines = [f"*AI 매수 추천 ({len(buy_recs)}개)*\n"]
+        lines.extend(
+            _BUY_LINE({
+                "icon": "🟢🟢" if r["action"] == "STRONG_BUY" else "🟢",
+                "ticker": r["ticker"],
+                "conf": int(r["confidence"] * 100),
+                "price": f"${r['price_at_recommendation']:.2f}" if r.get("price_at_recommendation") else "N/A",
+            })
+            for r in buy_recs[:10]
+        )
+        return lines
+
+    @staticmethod
+    def _format_sell_lines(active: list[dict]) -> list[str]:
+        lines = [f"*AI 매도 신호 ({len(active)}개)*\n"]
+        lines.extend(
+            _SELL_LINE({
+                "icon": URGENCY_ICON.get(s.get("urgency"), "🟡"),
+                "ticker": s["ticker"],
+                "pnl": s.get("current_pnl_pct", 0) or 0,
+                "reasoning": s.get("reasoning", "")[:50],
+            })
+            for s in order_by_urgency(active)[:10]
+        )
+        return lines
+
+    @staticmethod
+    def _format_summary_lines(summary: dict) -> list[str]:
+        total_pnl = summary.get("total_unrealized_pnl", 0)
+        total_pct = summary.get("total_unrealized_pnl_pct", 0)
+        sign = "+" if total_pnl >= 0 else ""
+        icon = "📈" if total_pnl >= 0 else "📉"
+
+        lines = [f"{icon} *오늘의 포트폴리오 요약*\n"]
+        lines.append(f"보유: {summary.get('total_holdings', 0)}개 종목")
+        lines.append(f"평가손익: {sign}${total_pnl:,.0f} ({sign}{total_pct:.2f}%)\n")
+
+        lines.extend(
+            _HOLDING_LINE({
+                "ticker": h["ticker"],
+                "sign": "+" if h["unrealized_pnl_pct"] >= 0 else "",
+                "pnl_pct": h["unrealized_pnl_pct"],
+            })
+            for h in summary.get("holdings", [])[:5]
+        )
+        return lines
+
+    @staticmethod
+    def _format_alert_lines(alerts: list[dict]) -> list[str]:
+        lines = [f"*가격 알림 ({len(alerts)}건)*\n"]
+        lines.extend(
+            _ALERT_LINE({
+                "icon": ALERT_ICON.get(a.get("alert_type", ""), "⚠️"),
+                "ticker": a["ticker"],
+                "alert_type": a.get("alert_type", ""),
+                "price": f"${a['current_price']:.2f}" if a.get("current_price") else "N/A",
+            })
+            for a in alerts[:10]
+        )
+        return lines
+
     # -- 공개 메서드 (카카오와 동일 인터페이스) --
 
     def send_buy_recommendations(self, recommendations: list[dict]) -> bool:
-        buy_recs = [r for r in recommendations if r.get("action") in ("BUY", "STRONG_BUY")]
+        if not self._is_configured():
+            return True
+        buy_recs = [r for r in recommendations if r.get("action") in BUY_ACTIONS]
         if not buy_recs:
             return True
 
-        lines = [f"*AI 매수 추천 ({len(buy_recs)}개)*\n"]
-        for r in buy_recs[:10]:
-            icon = "🟢🟢" if r["action"] == "STRONG_BUY" else "🟢"
-            conf = int(r["confidence"] * 100)
-            price = f"${r['price_at_recommendation']:.2f}" if r.get("price_at_recommendation") else "N/A"
-            lines.append(f"{icon} *{r['ticker']}* ({conf}%) | {price}")
-
-        success = self._send_message("\n".join(lines))
+        success = self._send_message("\n".join(self._format_buy_lines(buy_recs)))
         if success:
             logger.info(f"[텔레그램] 매수 추천 알림 전송 완료 ({len(buy_recs)}개)")
         return success
 
     def send_sell_signals(self, sell_signals: list[dict]) -> bool:
-        active = [s for s in sell_signals if s.get("signal") in ("SELL", "STRONG_SELL")]
+        if not self._is_configured():
+            return True
+        active = [s for s in sell_signals if s.get("signal") in SELL_SIGNALS]
         if not active:
             return True
 
-        urgency_order = {"HIGH": 0, "NORMAL": 1, "LOW": 2}
-        active.sort(key=lambda x: urgency_order.get(x.get("urgency", "LOW"), 2))
-
-        lines = [f"*AI 매도 신호 ({len(active)}개)*\n"]
-        for s in active[:10]:
-            icon = {"HIGH": "🔴", "NORMAL": "🟠", "LOW": "🟡"}.get(s.get("urgency"), "🟡")
-            pnl = s.get("current_pnl_pct", 0) or 0
-            lines.append(f"{icon} *{s['ticker']}* ({pnl:+.1f}%) | {s.get('reasoning', '')[:50]}")
-
-        success = self._send_message("\n".join(lines))
+        success = self._send_message("\n".join(self._format_sell_lines(active)))
         if success:
             logger.info(f"[텔레그램] 매도 신호 알림 전송 완료 ({len(active)}개)")
         return success
 
-    def send_daily_summary(self) -> bool:
-        from portfolio.portfolio_manager import portfolio_manager
-        try:
-            summary = portfolio_manager.get_summary()
-        except Exception as e:
-            logger.error(f"[텔레그램] 포트폴리오 조회 실패: {e}")
-            return False
-
-        total_pnl = summary.get("total_unrealized_pnl", 0)
-        total_pct = summary.get("total_unrealized_pnl_pct", 0)
-        sign = "+" if total_pnl >= 0 else ""
-        icon = "📈" if total_pnl >= 0 else "📉"
-
-        lines = [f"{icon} *오늘의 포트폴리오 요약*\n"]
-        lines.append(f"보유: {summary.get('total_holdings', 0)}개 종목")
-        lines.append(f"평가손익: {sign}${total_pnl:,.0f} ({sign}{total_pct:.2f}%)\n")
-
-        for h in summary.get("holdings", [])[:5]:
-            s = "+" if h["unrealized_pnl_pct"] >= 0 else ""
-            lines.append(f"  {h['ticker']}: {s}{h['unrealized_pnl_pct']:.1f}%")
+    def send_daily_summary(self, summary: Optional[dict] = None) -> bool:
+        if not self._is_configured():
+            return True
+        if summary is None:
+            from portfolio.portfolio_manager import portfolio_manager
+            try:
+                summary = portfolio_manager.get_summary()
+            except Exception as e:
+                logger.error(f"[텔레그램] 포트폴리오 조회 실패: {e}")
+                return False
 
-        success = self._send_message("\n".join(lines))
+        success = self._send_message("\n".join(self._format_summary_lines(summary)))
         if success:
             logger.info("[텔레그램] 일일 포트폴리오 요약 전송 완료")
         return success
@@ -128,18 +197,46 @@ class TelegramNotifier:
         if not self._is_configured():
             return True
 
-        icon_map = {"STOP_LOSS": "🔴", "TARGET_PRICE": "🎯", "VOLUME_SURGE": "📊"}
-        lines = [f"*가격 알림 ({len(alerts)}건)*\n"]
-        for a in alerts[:10]:
-            icon = icon_map.get(a.get("alert_type", ""), "⚠️")
-            price = f"${a['current_price']:.2f}" if a.get("current_price") else "N/A"
-            lines.append(f"{icon} *{a['ticker']}* {a.get('alert_type', '')} | 현재 {price}")
-
-        success = self._send_message("\n".join(lines))
+        success = self._send_message("\n".join(self._format_alert_lines(alerts)))
         if success:
             logger.info(f"[텔레그램] 가격 알림 전송 완료 ({len(alerts)}건)")
         return success
 
+    def send_digest(
+        self,
+        *,
+        buys: Optional[list[dict]] = None,
+        sells: Optional[list[dict]] = None,
+        alerts: Optional[list[dict]] = None,
+        summary: Optional[dict] = None,
+    ) -> bool:
+        """
+        매수 추천/매도 신호/가격 알림/포트폴리오 요약을 섹션별로 묶어 메시지 1건으로 전송합니다.
+        개별 send_* 를 연달아 호출할 때보다 요청 수(RTT, rate limit 소모)가 1회로 줄어듭니다.
+        notifications.dispatch가 2종 이상을 함께 발송할 때 사용합니다.
+        """
+        if not self._is_configured():
+            return True
+
+        buy_recs = [r for r in buys or () if r.get("action") in BUY_ACTIONS]
+        active = [s for s in sells or () if s.get("signal") in SELL_SIGNALS]
+        sections = []
+        if buy_recs:
+            sections.append(self._format_buy_lines(buy_recs))
+        if active:
+            sections.append(self._format_sell_lines(active))
+        if alerts:
+            sections.append(self._format_alert_lines(alerts))
+        if summary:
+            sections.append(self._format_summary_lines(summary))
+        if not sections:
+            return True
+
+        success = self._send_message("\n\n".join("\n".join(lines) for lines in sections))
+        if success:
+            logger.info(f"[텔레그램] 다이제스트 전송 완료 ({len(sections)}개 섹션)")
+        return success
+
     def test_connection(self) -> bool:
         if not self._is_configured():
             logger.warning("[텔레그램] TELEGRAM_BOT_TOKEN 또는 CHAT_ID가 미설정입니다.")
@@ -2,16 +2,140 @@
 포트폴리오 관리 모듈
 보유 종목의 매수/매도 기록과 손익 계산을 담당합니다.
 """
+import functools
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import numpy as np
 from loguru import logger
-from sqlalchemy import desc
+from sqlalchemy import bindparam, delete, desc, extract, func, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, joinedload
 
 from database.connection import get_db
 from database.models import PortfolioHolding, Stock, Transaction
 from data_fetcher.market_data import market_fetcher
 
+HISTORY_CHUNK_SIZE = 1000  # 거래 이력 스트리밍 조회 시 한 번에 가져오는 행 수
+VECTORIZE_MIN_HOLDINGS = 20  # 보유 종목 수가 이보다 많을 때만 NumPy로 손익 일괄 계산
+VALUATION_WRITE_INTERVAL = 30  # 같은 보유 종목의 평가값(현재가/평가손익) DB 기록 최소 간격 (초)
+
+# 단건 조회 구문은 모듈 로드 시 1회만 구성하고 값은 바인드 파라미터로 전달
+# (호출마다 같은 구문 객체를 재사용 → 엔진의 컴파일 캐시 조회만으로 SQL 문자열 재사용)
+_STOCK_ID_BY_TICKER = select(Stock.id).where(Stock.ticker == bindparam("ticker"))
+
+# 매수/매도는 보유 현황을 읽고 다시 쓰므로 같은 종목의 동시 거래가 서로의 갱신을 덮어쓰지 않도록
+# 행 잠금(SELECT ... FOR UPDATE)으로 조회. 매수는 보유 현황이 아직 없을 수 있어 종목 행을 잠금
+# (outer join의 nullable 쪽은 잠글 수 없음).
+# SQLite는 FOR UPDATE를 무시하므로 이 경로들은 get_db(write_lock=True)로 BEGIN IMMEDIATE 트랜잭션을
+# 열어 조회 시점부터 DB 쓰기 잠금을 잡음
+_HOLDING_BY_STOCK_ID = (
+    select(PortfolioHolding)
+    .where(PortfolioHolding.stock_id == bindparam("stock_id"))
+    .with_for_update()
+)
+_HOLDING_LOCKING_STOCK = (
+    select(PortfolioHolding)
+    .select_from(Stock)
+    .outerjoin(PortfolioHolding, PortfolioHolding.stock_id == Stock.id)
+    .where(Stock.id == bindparam("stock_id"))
+    .with_for_update(of=Stock)
+)
+
+CONFLICT_MAX_ATTEMPTS = 3  # 직렬화 실패/잠금 충돌 시 거래 기록 최대 시도 횟수
+CONFLICT_BASE_DELAY = 0.1  # 재시도 대기 시간 (초, 시도마다 2배)
+_CONFLICT_SQLSTATES = {"40001", "40P01"}  # serialization_failure, deadlock_detected
+
+
+def _is_conflict(e: OperationalError) -> bool:
+    """동시 트랜잭션 충돌(재시도하면 성공할 수 있는 오류) 여부"""
+    orig = e.orig
+    sqlstate = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return sqlstate in _CONFLICT_SQLSTATES or "database is locked" in str(orig)
+
+
+def _retry_on_conflict(func):
+    """거래 기록 트랜잭션이 동시성 충돌로 실패하면 지수 백오프로 재시도하는 데코레이터"""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for attempt in range(1, CONFLICT_MAX_ATTEMPTS + 1):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as e:
+                if attempt == CONFLICT_MAX_ATTEMPTS or not _is_conflict(e):
+                    raise
+                delay = CONFLICT_BASE_DELAY * 2 ** (attempt - 1)
+                logger.warning(
+                    f"[포트폴리오] {func.__name__} 동시성 충돌, {delay:.1f}초 후 재시도 "
+                    f"({attempt}/{CONFLICT_MAX_ATTEMPTS})"
+                )
+                time.sleep(delay)
+
+    return wrapper
+
+
+# 행 단위로 호출되는 날짜 포맷은 strftime(매 호출마다 포맷 문자열 해석) 대신 필드 직접 포맷
+def _format_date(dt: datetime) -> str:
+    """YYYY-MM-DD"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+def _format_minute(dt: datetime) -> str:
+    """YYYY-MM-DD HH:MM"""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _compute_pnl(
+    prices: list[float], qtys: list[float], invested: list[float]
+) -> tuple[list[float], list[float], list[float]]:
+    """
+    보유 종목별 평가금액, 평가손익, 평가손익률(%)을 계산합니다.
+    종목 수가 VECTORIZE_MIN_HOLDINGS를 넘으면 NumPy 배열 연산으로 한 번에 처리하고,
+    그 이하에서는 배열 생성 비용이 더 크므로 파이썬 루프로 계산합니다.
+    """
+    n = len(prices)
+    if n <= VECTORIZE_MIN_HOLDINGS:
+        values = [p * q for p, q in zip(prices, qtys)]
+        pnls = [v - i for v, i in zip(values, invested)]
+        pcts = [(pnl / i * 100) if i else 0.0 for pnl, i in zip(pnls, invested)]
+        return values, pnls, pcts
+
+    price_arr = np.fromiter(prices, dtype=np.float64, count=n)
+    qty_arr = np.fromiter(qtys, dtype=np.float64, count=n)
+    invested_arr = np.fromiter(invested, dtype=np.float64, count=n)
+    value_arr = price_arr * qty_arr
+    pnl_arr = value_arr - invested_arr
+    # 투자금 0인 종목은 0으로 두고 나눗셈 자체를 건너뜀 (0 나눗셈 경고 방지)
+    pct_arr = np.divide(
+        pnl_arr, invested_arr, out=np.zeros(n), where=invested_arr != 0
+    ) * 100
+    return value_arr.tolist(), pnl_arr.tolist(), pct_arr.tolist()
+
+
+def _write_valuations(db: Session, updates: list[dict]) -> None:
+    """
+    변경된 평가값을 기본키 기준 UPDATE로 기록합니다 (컬럼 조합별 executemany 1회).
+    그 사이 다른 프로세스가 삭제한 보유 종목이 있어도 나머지는 기록되도록
+    ORM bulk UPDATE(행 수 검사) 대신 Core UPDATE ... WHERE id = :holding_id 를 사용합니다.
+    """
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for values in updates:
+        columns = tuple(sorted(k for k in values if k != "id"))
+        groups.setdefault(columns, []).append(
+            {"holding_id": values["id"], **{c: values[c] for c in columns}}
+        )
+    table = PortfolioHolding.__table__
+    for columns, params in groups.items():
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("holding_id"))
+            .values({c: bindparam(c) for c in columns}),
+            params,
+        )
+
 
 class PortfolioManager:
     """
@@ -23,9 +147,72 @@ class PortfolioManager:
       - 포트폴리오 전체 현황 요약
     """
 
+    def __init__(self):
+        # {ticker: stock_id} — 커밋된 종목 id만 담으며, 종목 id는 바뀌지 않으므로 무효화가 필요 없음.
+        # 미등록 티커는 캐시하지 않으므로 새로 등록된 종목은 다음 조회에서 바로 반영됨
+        self._ticker_ids: dict[str, int] = {}
+        # {holding_id: (기록 시각(monotonic), 수량, 투자금)} — 대시보드 폴링마다 평가값을 다시 쓰지 않도록
+        # 마지막 기록 후 VALUATION_WRITE_INTERVAL 동안은 생략. 거래로 수량/투자금이 바뀌면 즉시 기록
+        self._valuations_written: dict[int, tuple[float, float, float]] = {}
+
+    def _stock_id(self, db: Session, ticker: str) -> Optional[int]:
+        """티커의 종목 id (캐시 적중 시 조회 없음, 미스 시 Stock.id 컬럼만 조회)"""
+        stock_id = self._ticker_ids.get(ticker)
+        if stock_id is None:
+            stock_id = db.execute(_STOCK_ID_BY_TICKER, {"ticker": ticker}).scalar_one_or_none()
+            if stock_id is not None:
+                self._ticker_ids[ticker] = stock_id
+        return stock_id
+
+    def _register_stocks(self, tickers: set[str]) -> dict[str, int]:
+        """
+        티커별 종목 id를 반환하며, 미등록 종목은 종목별 짧은 트랜잭션으로 먼저 등록합니다.
+        종목 정보 조회(yfinance 네트워크 호출)가 매수 트랜잭션의 DB 쓰기 잠금을 붙잡고 있지 않도록
+        get_db(write_lock=True) 이전에 호출하며, 등록할 수 없는 종목이 있으면
+        거래를 기록하기 전에 ValueError를 발생시킵니다.
+        """
+        stock_ids = {t: self._ticker_ids[t] for t in tickers if t in self._ticker_ids}
+        uncached = tickers - stock_ids.keys()
+        if not uncached:
+            return stock_ids
+
+        with get_db() as db:
+            found = dict(
+                db.execute(select(Stock.ticker, Stock.id).where(Stock.ticker.in_(uncached))).all()
+            )
+        self._ticker_ids.update(found)
+        stock_ids.update(found)
+
+        for ticker in sorted(tickers - stock_ids.keys()):
+            with get_db() as db:
+                stock = market_fetcher.sync_stock_info(ticker, db)
+                if stock is None:
+                    raise ValueError(f"종목을 찾을 수 없습니다: {ticker}")
+                stock_id = stock.id
+            # get_db() 종료 시 커밋된 id이므로 캐시해도 안전
+            self._ticker_ids[ticker] = stock_id
+            stock_ids[ticker] = stock_id
+        return stock_ids
+
+    def _find_holding(
+        self, db: Session, ticker: str
+    ) -> tuple[Optional[PortfolioHolding], Optional[int]]:
+        """
+        티커의 보유 현황을 종목 id로 잠금 조회합니다.
+
+        Returns:
+            (holding, stock_id) — 미보유면 (None, stock_id), 미등록 종목이면 (None, None)
+        """
+        stock_id = self._stock_id(db, ticker)
+        if stock_id is None:
+            return None, None
+        holding = db.execute(_HOLDING_BY_STOCK_ID, {"stock_id": stock_id}).scalar_one_or_none()
+        return holding, stock_id
+
     # ─────────────────────────────────────────
     # 매수 기록
     # ─────────────────────────────────────────
+    @_retry_on_conflict
     def buy(
         self,
         ticker: str,
@@ -52,17 +239,18 @@ class PortfolioManager:
         executed_at = executed_at or datetime.now(timezone.utc).replace(tzinfo=None)
         total_amount = quantity * price + fee
 
-        with get_db() as db:
-            # 종목 조회 / 등록
-            stock = db.query(Stock).filter(Stock.ticker == ticker).first()
-            if stock is None:
-                stock = market_fetcher.sync_stock_info(ticker, db)
-            if stock is None:
-                raise ValueError(f"종목을 찾을 수 없습니다: {ticker}")
+        # 미등록 종목은 쓰기 잠금 밖에서 등록 (잠금은 보유 현황 읽기-수정-쓰기 동안만 유지)
+        stock_id = self._register_stocks({ticker})[ticker]
+
+        with get_db(write_lock=True) as db:
+            # 종목 행을 잠그고 보유 현황을 함께 조회 (미보유 종목은 holding=None)
+            holding = db.execute(
+                _HOLDING_LOCKING_STOCK, {"stock_id": stock_id}
+            ).scalar_one_or_none()
 
             # 거래 내역 저장
             tx = Transaction(
-                stock_id=stock.id,
+                stock_id=stock_id,
                 action="BUY",
                 quantity=quantity,
                 price=price,
@@ -74,14 +262,9 @@ class PortfolioManager:
             db.add(tx)
 
             # 보유 현황 업데이트
-            holding = (
-                db.query(PortfolioHolding)
-                .filter(PortfolioHolding.stock_id == stock.id)
-                .first()
-            )
             if holding is None:
                 holding = PortfolioHolding(
-                    stock_id=stock.id,
+                    stock_id=stock_id,
                     quantity=quantity,
                     avg_buy_price=price,
                     total_invested=total_amount,
@@ -96,16 +279,114 @@ class PortfolioManager:
                 holding.quantity = new_quantity
                 holding.total_invested = new_invested
 
-            db.flush()
+            # flush 없이 get_db() 종료 시 commit 1회로 INSERT/UPDATE를 함께 전송
+            # (expire_on_commit=False 이므로 반환된 tx의 id 등은 commit 후에도 유효)
             logger.success(
                 f"[매수] {ticker} {quantity}주 @ ${price:.2f} "
                 f"(총 ${total_amount:.2f}, 수수료 ${fee:.2f})"
             )
             return tx
 
+    @_retry_on_conflict
+    def buy_many(self, trades: list[dict]) -> int:
+        """
+        여러 건의 매수 거래를 한 트랜잭션으로 일괄 기록합니다.
+        buy()를 순서대로 반복 호출한 것과 같은 결과를 남기며, 종목 조회(IN 1회),
+        거래 INSERT(executemany 1회), 보유 현황 INSERT/UPDATE(각 1회)로 처리합니다.
+
+        Args:
+            trades: [{"ticker", "quantity", "price", "fee"?, "note"?, "executed_at"?}]
+
+        Returns:
+            기록된 거래 건수
+        """
+        if not trades:
+            return 0
+        for t in trades:
+            if t["quantity"] <= 0 or t["price"] <= 0:
+                raise ValueError(f"[{t['ticker']}] 수량과 가격은 0보다 커야 합니다.")
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        # 종목 조회(캐시 미스분 IN 1회)와 미등록 종목 등록은 쓰기 잠금을 잡기 전에 처리
+        stock_ids = self._register_stocks({t["ticker"] for t in trades})
+
+        with get_db(write_lock=True) as db:
+            tx_rows: list[dict] = []
+            # {stock_id: [수량 합계, 투자금 합계, 첫 체결 시각, 평균 매수가(1건뿐이면 체결가)]}
+            totals: dict[int, list] = {}
+            for t in trades:
+                stock_id = stock_ids[t["ticker"]]
+                fee = t.get("fee", 0.0)
+                total_amount = t["quantity"] * t["price"] + fee
+                executed_at = t.get("executed_at") or now
+                tx_rows.append({
+                    "stock_id": stock_id,
+                    "action": "BUY",
+                    "quantity": t["quantity"],
+                    "price": t["price"],
+                    "total_amount": total_amount,
+                    "fee": fee,
+                    "note": t.get("note"),
+                    "executed_at": executed_at,
+                })
+                entry = totals.get(stock_id)
+                if entry is None:
+                    totals[stock_id] = [t["quantity"], total_amount, executed_at, t["price"]]
+                else:
+                    entry[0] += t["quantity"]
+                    entry[1] += total_amount
+                    entry[3] = entry[1] / entry[0]
+
+            db.execute(insert(Transaction), tx_rows)
+
+            # 보유 현황: 기존 보유분은 PK 기준 일괄 UPDATE, 신규 종목은 일괄 INSERT
+            existing = {
+                stock_id: (holding_id, quantity, invested)
+                for holding_id, stock_id, quantity, invested in db.execute(
+                    select(
+                        PortfolioHolding.id,
+                        PortfolioHolding.stock_id,
+                        PortfolioHolding.quantity,
+                        PortfolioHolding.total_invested,
+                    )
+                    .where(PortfolioHolding.stock_id.in_(totals.keys()))
+                    .with_for_update()
+                )
+            }
+            new_rows: list[dict] = []
+            changed_rows: list[dict] = []
+            for stock_id, (quantity, invested, first_at, avg_price) in totals.items():
+                if stock_id in existing:
+                    holding_id, held_qty, held_invested = existing[stock_id]
+                    quantity += held_qty
+                    invested += held_invested
+                    changed_rows.append({
+                        "id": holding_id,
+                        "quantity": quantity,
+                        "avg_buy_price": invested / quantity,
+                        "total_invested": invested,
+                    })
+                else:
+                    new_rows.append({
+                        "stock_id": stock_id,
+                        "quantity": quantity,
+                        "avg_buy_price": avg_price,
+                        "total_invested": invested,
+                        "first_bought_at": first_at,
+                    })
+            if new_rows:
+                db.execute(insert(PortfolioHolding), new_rows)
+            if changed_rows:
+                db.execute(update(PortfolioHolding), changed_rows)
+
+        logger.success(f"[일괄 매수] {len(trades)}건 기록 ({len(totals)}개 종목)")
+        return len(trades)
+
     # ─────────────────────────────────────────
     # 매도 기록
     # ─────────────────────────────────────────
+    @_retry_on_conflict
     def sell(
         self,
         ticker: str,
@@ -129,16 +410,10 @@ class PortfolioManager:
         executed_at = executed_at or datetime.now(timezone.utc).replace(tzinfo=None)
         total_amount = quantity * price - fee
 
-        with get_db() as db:
-            stock = db.query(Stock).filter(Stock.ticker == ticker).first()
-            if stock is None:
+        with get_db(write_lock=True) as db:
+            holding, stock_id = self._find_holding(db, ticker)
+            if stock_id is None:
                 raise ValueError(f"종목을 찾을 수 없습니다: {ticker}")
-
-            holding = (
-                db.query(PortfolioHolding)
-                .filter(PortfolioHolding.stock_id == stock.id)
-                .first()
-            )
             if holding is None or holding.quantity < quantity:
                 raise ValueError(
                     f"[{ticker}] 보유 수량 부족 "
@@ -150,7 +425,7 @@ class PortfolioManager:
 
             # 거래 내역 저장
             tx = Transaction(
-                stock_id=stock.id,
+                stock_id=stock_id,
                 action="SELL",
                 quantity=quantity,
                 price=price,
@@ -162,18 +437,27 @@ class PortfolioManager:
             )
             db.add(tx)
 
-            # 보유 현황 업데이트
-            holding.quantity -= quantity
-            holding.total_invested -= holding.avg_buy_price * quantity
+            # 보유 현황 업데이트: 잠금 조회한 값으로 결과를 미리 계산해 DELETE 또는 UPDATE 1문만 실행
+            # (ORM 속성 변경 없이 실행하므로 commit 시 추가 flush 대상 없음)
+            remaining = holding.quantity - quantity
 
-            if holding.quantity <= 0:
+            if remaining <= 0:
                 # 전량 매도 → 보유 종목 삭제
-                db.delete(holding)
-                logger.info(f"[{ticker}] 전량 매도 완료, 보유 목록에서 제거")
+                stmt = delete(PortfolioHolding)
             else:
-                holding.total_invested = max(holding.total_invested, 0)
+                stmt = update(PortfolioHolding).values(
+                    quantity=remaining,
+                    total_invested=max(
+                        holding.total_invested - holding.avg_buy_price * quantity, 0
+                    ),
+                )
+            db.execute(
+                stmt.where(PortfolioHolding.id == holding.id)
+                .execution_options(synchronize_session=False)
+            )
+            if remaining <= 0:
+                logger.info(f"[{ticker}] 전량 매도 완료, 보유 목록에서 제거")
 
-            db.flush()
             logger.success(
                 f"[매도] {ticker} {quantity}주 @ ${price:.2f} "
                 f"| 실현손익: ${realized_pnl:+.2f}"
@@ -186,6 +470,8 @@ class PortfolioManager:
     def get_holdings(self, update_prices: bool = True) -> list[dict]:
         """
         현재 보유 종목 목록과 평가손익을 반환합니다.
+        바뀐 평가값은 같은 트랜잭션에서 DB에 기록하되, 대시보드 폴링으로 인한 반복 쓰기를 줄이도록
+        보유 종목별로 VALUATION_WRITE_INTERVAL에 한 번만 기록합니다 (거래로 수량/투자금이 바뀌면 즉시).
 
         Args:
             update_prices: True이면 실시간 가격으로 손익 갱신
@@ -193,34 +479,63 @@ class PortfolioManager:
         results = []
 
         with get_db() as db:
-            rows = (
-                db.query(PortfolioHolding, Stock)
-                .join(Stock, PortfolioHolding.stock_id == Stock.id)
+            # stock 관계를 같은 SELECT에서 즉시 로드 (행마다 lazy load 방지)
+            holdings = (
+                db.query(PortfolioHolding)
+                .options(joinedload(PortfolioHolding.stock, innerjoin=True))
                 .all()
             )
 
-            for h, stock in rows:
-
-                current_price = h.current_price or h.avg_buy_price
+            # 보유 종목 현재가를 1회 일괄 조회 (종목별 개별 호출 방지)
+            prices = (
+                market_fetcher.fetch_realtime_prices([h.stock.ticker for h in holdings])
+                if update_prices and holdings else {}
+            )
 
-                if update_prices:
-                    price_data = market_fetcher.fetch_realtime_price(stock.ticker)
-                    if price_data:
-                        current_price = price_data["price"]
-                        h.current_price = current_price
+            updates: list[dict] = []
+            now_mono = time.monotonic()
 
-                current_value = current_price * h.quantity
-                unrealized_pnl = current_value - h.total_invested
-                unrealized_pnl_pct = (
-                    (unrealized_pnl / h.total_invested * 100) if h.total_invested else 0.0
-                )
+            # 1) 종목별 현재가 결정 (캐시 TTL이 지난 stale 시세인지 함께 기록)
+            current_prices: list[float] = []
+            stale_flags: list[bool] = []
+            for h in holdings:
+                current_price = h.current_price or h.avg_buy_price
+                price_data = prices.get(h.stock.ticker)
+                if price_data:
+                    current_price = price_data["price"]
+                current_prices.append(current_price)
+                stale_flags.append(bool(price_data and price_data.get("stale")))
+
+            # 2) 평가금액/손익/손익률을 전 종목 일괄 계산
+            values, pnls, pcts = _compute_pnl(
+                current_prices,
+                [h.quantity for h in holdings],
+                [h.total_invested for h in holdings],
+            )
 
-                h.unrealized_pnl = unrealized_pnl
-                h.unrealized_pnl_pct = unrealized_pnl_pct
+            # 3) 변경분 수집 및 결과 조립
+            for h, current_price, stale, current_value, unrealized_pnl, unrealized_pnl_pct in zip(
+                holdings, current_prices, stale_flags, values, pnls, pcts
+            ):
+                stock = h.stock
+                changes: dict = {}
+
+                # stale 시세는 화면 표시에만 쓰고 DB에는 기록하지 않음
+                # (DB 현재가를 읽는 알림 체크가 지연된 가격으로 평가하지 않도록)
+                if not stale and self._valuation_due(h, now_mono):
+                    if prices.get(stock.ticker) and current_price != h.current_price:
+                        changes["current_price"] = current_price
+                    if unrealized_pnl != h.unrealized_pnl or unrealized_pnl_pct != h.unrealized_pnl_pct:
+                        changes["unrealized_pnl"] = unrealized_pnl
+                        changes["unrealized_pnl_pct"] = unrealized_pnl_pct
+                if changes:
+                    changes["id"] = h.id
+                    updates.append(changes)
 
                 results.append({
                     "ticker": stock.ticker,
                     "name": stock.name,
+                    "sector": stock.sector or "Unknown",
                     "quantity": h.quantity,
                     "avg_buy_price": h.avg_buy_price,
                     "current_price": current_price,
@@ -228,15 +543,56 @@ class PortfolioManager:
                     "current_value": current_value,
                     "unrealized_pnl": unrealized_pnl,
                     "unrealized_pnl_pct": unrealized_pnl_pct,
-                    "first_bought_at": h.first_bought_at.strftime("%Y-%m-%d"),
+                    "first_bought_at": _format_date(h.first_bought_at),
+                    "stale": stale,
                 })
 
+            # 변경된 평가값만 같은 세션에서 즉시 기록 (알림 체크 등 다른 프로세스도 최신 값을 읽도록)
+            if updates:
+                _write_valuations(db, updates)
+
+        # 커밋된 뒤에만 기록 시각을 남김 (커밋 실패 시 다음 조회에서 다시 기록).
+        # 현재가 없이 손익만 다시 쓴 경우(update_prices=False)는 다음 실시세 기록을 막지 않도록 제외
+        if updates:
+            basis = {h.id: (h.quantity, h.total_invested) for h in holdings}
+            for values in updates:
+                if "current_price" in values:
+                    self._valuations_written[values["id"]] = (now_mono, *basis[values["id"]])
+
         return sorted(results, key=lambda x: x["unrealized_pnl_pct"], reverse=True)
 
+    def _valuation_due(self, holding: PortfolioHolding, now_mono: float) -> bool:
+        """보유 종목의 평가값을 이번 조회에서 DB에 기록할 차례인지 여부"""
+        written = self._valuations_written.get(holding.id)
+        if written is None:
+            return True
+        written_at, quantity, invested = written
+        return (
+            (quantity, invested) != (holding.quantity, holding.total_invested)
+            or now_mono - written_at >= VALUATION_WRITE_INTERVAL
+        )
+
     def get_summary(self) -> dict:
         """포트폴리오 전체 요약 정보를 반환합니다."""
+        return self._summarize(self.get_holdings(update_prices=True))
+
+    def get_dashboard_snapshot(self) -> dict:
+        """
+        대시보드용 요약 정보와 섹터별 비중을 함께 반환합니다.
+        get_holdings를 한 번만 호출해 두 결과를 같은 보유 목록에서 계산합니다.
+
+        Returns:
+            {"summary": get_summary 결과, "sector_allocation": get_sector_allocation 결과}
+        """
         holdings = self.get_holdings(update_prices=True)
+        return {
+            "summary": self._summarize(holdings),
+            "sector_allocation": self._allocate_by_sector(holdings),
+        }
 
+    @staticmethod
+    def _summarize(holdings: list[dict]) -> dict:
+        """보유 목록으로 포트폴리오 요약 정보 구성"""
         total_invested = sum(h["total_invested"] for h in holdings)
         total_value = sum(h["current_value"] for h in holdings)
         total_pnl = total_value - total_invested
@@ -249,6 +605,7 @@ class PortfolioManager:
             "total_unrealized_pnl": total_pnl,
             "total_unrealized_pnl_pct": total_pnl_pct,
             "holdings": holdings,
+            "stale_tickers": [h["ticker"] for h in holdings if h.get("stale")],
             "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
 
@@ -265,30 +622,47 @@ class PortfolioManager:
         """
         since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
 
+        history: list[dict] = []
         with get_db() as db:
-            rows = (
-                db.query(Transaction, Stock.ticker, Stock.name)
+            # 읽기 전용 투영이므로 ORM 인스턴스 대신 컬럼 Row만 조회.
+            # yield_per: 서버 측 커서로 HISTORY_CHUNK_SIZE행씩 받아 처리 (전체 결과 버퍼링 방지).
+            # 스트리밍 중에는 세션이 열려 있어야 하므로 변환을 with 블록 안에서 끝냄
+            rows = db.execute(
+                select(
+                    Stock.ticker,
+                    Stock.name,
+                    Transaction.action,
+                    Transaction.quantity,
+                    Transaction.price,
+                    Transaction.total_amount,
+                    Transaction.fee,
+                    Transaction.realized_pnl,
+                    Transaction.note,
+                    Transaction.executed_at,
+                )
                 .join(Stock, Transaction.stock_id == Stock.id)
-                .filter(Transaction.executed_at >= since)
+                .where(Transaction.executed_at >= since)
                 .order_by(desc(Transaction.executed_at))
-                .all()
+                .execution_options(yield_per=HISTORY_CHUNK_SIZE)
             )
-
-            return [
-                {
+            for (
+                ticker, name, action, quantity, price,
+                total_amount, fee, realized_pnl, note, executed_at,
+            ) in rows:
+                history.append({
                     "ticker": ticker,
                     "name": name,
-                    "action": tx.action,
-                    "quantity": tx.quantity,
-                    "price": tx.price,
-                    "total_amount": tx.total_amount,
-                    "fee": tx.fee,
-                    "realized_pnl": tx.realized_pnl,
-                    "note": tx.note,
-                    "executed_at": tx.executed_at.strftime("%Y-%m-%d %H:%M"),
-                }
-                for tx, ticker, name in rows
-            ]
+                    "action": action,
+                    "quantity": quantity,
+                    "price": price,
+                    "total_amount": total_amount,
+                    "fee": fee,
+                    "realized_pnl": realized_pnl,
+                    "note": note,
+                    "executed_at": _format_minute(executed_at),
+                })
+
+        return history
 
     def get_realized_pnl_by_period(self) -> dict:
         """
@@ -301,31 +675,34 @@ class PortfolioManager:
             }
         """
         with get_db() as db:
-            sells = (
-                db.query(Transaction)
+            # 월별 합계/건수는 DB에서 GROUP BY로 집계 (SELL 행 전체를 ORM 객체로 읽지 않음).
+            # ORDER BY 연/월로 월 순서대로 받으므로 Python 측 정렬은 하지 않음.
+            # EXTRACT는 SQLAlchemy가 DB별 구문으로 컴파일하므로(SQLite는 strftime) 모든 DB에서 동작하고,
+            # "YYYY-MM" 키는 Python에서 만듦
+            year = extract("year", Transaction.executed_at).label("year")
+            month = extract("month", Transaction.executed_at).label("month")
+            rows = (
+                db.query(year, month, func.sum(Transaction.realized_pnl), func.count(Transaction.id))
                 .filter(
                     Transaction.action == "SELL",
-                    Transaction.realized_pnl != None,
+                    Transaction.realized_pnl.isnot(None),
                 )
-                .order_by(Transaction.executed_at.asc())
+                .group_by(year, month)
+                .order_by(year, month)
                 .all()
             )
 
-        monthly: dict[str, dict] = {}
+        # 월별 목록과 전체 합계를 한 번의 순회로 계산 (월 합계는 한 번만 꺼내 재사용)
+        monthly_list = []
         total_realized = 0.0
-
-        for tx in sells:
-            month_key = tx.executed_at.strftime("%Y-%m")
-            if month_key not in monthly:
-                monthly[month_key] = {"realized_pnl": 0.0, "trade_count": 0}
-            monthly[month_key]["realized_pnl"] += tx.realized_pnl or 0.0
-            monthly[month_key]["trade_count"] += 1
-            total_realized += tx.realized_pnl or 0.0
-
-        monthly_list = [
-            {"month": k, "realized_pnl": round(v["realized_pnl"], 4), "trade_count": v["trade_count"]}
-            for k, v in sorted(monthly.items())
-        ]
+        for year_num, month_num, pnl_sum, count in rows:
+            pnl = pnl_sum or 0.0
+            total_realized += pnl
+            monthly_list.append({
+                "month": f"{int(year_num):04d}-{int(month_num):02d}",
+                "realized_pnl": round(pnl, 4),
+                "trade_count": count,
+            })
 
         return {
             "monthly": monthly_list,
@@ -339,7 +716,11 @@ class PortfolioManager:
         Returns:
             [{"sector": str, "value": float, "pct": float}] 내림차순
         """
-        holdings = self.get_holdings(update_prices=False)
+        return self._allocate_by_sector(self.get_holdings(update_prices=False))
+
+    @staticmethod
+    def _allocate_by_sector(holdings: list[dict]) -> list[dict]:
+        """보유 목록으로 섹터별 비중 계산"""
         if not holdings:
             return []
 
@@ -347,24 +728,10 @@ class PortfolioManager:
         if total_value == 0:
             return []
 
-        # 단일 쿼리로 보유 종목 전체 섹터 일괄 조회
-        tickers = [h["ticker"] for h in holdings]
-        ticker_sectors: dict[str, str] = {}
-
-        with get_db() as db:
-            stocks = db.query(Stock).filter(Stock.ticker.in_(tickers)).all()
-            for stock in stocks:
-                ticker_sectors[stock.ticker] = stock.sector if stock.sector else "Unknown"
-
-        # 조회되지 않은 티커는 "Unknown" 처리
-        for ticker in tickers:
-            ticker_sectors.setdefault(ticker, "Unknown")
-
-        # 섹터별 가치 집계
-        sector_map: dict[str, float] = {}
+        # 섹터별 가치 집계 (섹터는 get_holdings의 JOIN 결과를 재사용 → 추가 쿼리 없음)
+        sector_map: defaultdict[str, float] = defaultdict(float)
         for h in holdings:
-            sector = ticker_sectors[h["ticker"]]
-            sector_map[sector] = sector_map.get(sector, 0.0) + h["current_value"]
+            sector_map[h["sector"]] += h["current_value"]
 
         return sorted(
             [
@@ -382,6 +749,7 @@ class PortfolioManager:
     # ─────────────────────────────────────────
     # 종목 삭제 (포트폴리오에서 제거)
     # ─────────────────────────────────────────
+    @_retry_on_conflict
     def delete_holding(self, ticker: str) -> bool:
         """
         보유 종목을 포트폴리오에서 완전히 삭제합니다.
@@ -394,17 +762,11 @@ class PortfolioManager:
         Returns:
             True: 삭제 성공, False: 종목 미보유
         """
-        with get_db() as db:
-            stock = db.query(Stock).filter(Stock.ticker == ticker).first()
-            if stock is None:
+        with get_db(write_lock=True) as db:
+            holding, stock_id = self._find_holding(db, ticker)
+            if stock_id is None:
                 logger.warning(f"[삭제] 종목을 찾을 수 없음: {ticker}")
                 return False
-
-            holding = (
-                db.query(PortfolioHolding)
-                .filter(PortfolioHolding.stock_id == stock.id)
-                .first()
-            )
             if holding is None:
                 logger.warning(f"[삭제] 보유하지 않은 종목: {ticker}")
                 return False
@@ -412,16 +774,29 @@ class PortfolioManager:
             # 관련 알림 삭제
             try:
                 from database.models import PriceAlert
-                db.query(PriceAlert).filter(PriceAlert.stock_id == stock.id).delete()
+                db.query(PriceAlert).filter(PriceAlert.stock_id == stock_id).delete()
             except Exception:
                 pass
 
-            db.delete(holding)
+            db.execute(
+                delete(PortfolioHolding)
+                .where(PortfolioHolding.stock_id == stock_id)
+                .execution_options(synchronize_session=False)
+            )
+            # 종목명은 로그에만 쓰이므로 삭제 시에만 name 컬럼 1개를 조회
+            name = db.scalar(select(Stock.name).where(Stock.id == stock_id))
             logger.success(
-                f"[삭제] {ticker} ({stock.name}) 포트폴리오에서 제거 완료 "
+                f"[삭제] {ticker} ({name}) 포트폴리오에서 제거 완료 "
                 f"(수량: {holding.quantity}주, 투자금: ${holding.total_invested:.2f})"
             )
-            return True
+
+        # 삭제된 알림이 이 프로세스의 알림 조건 캐시에 남지 않도록 즉시 무효화
+        try:
+            from notifications.alert_manager import alert_manager
+            alert_manager.invalidate_conditions_cache()
+        except Exception:
+            pass
+        return True
 
     def print_summary(self) -> None:
         """포트폴리오 현황을 콘솔에 출력합니다."""
@@ -0,0 +1,29 @@
+"""
+테스트 공용 fixture
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def db_session_factory(tmp_path, monkeypatch):
+    """database.connection.SessionLocal을 임시 파일 DB로 교체 (스레드 간 공유 가능, 종목 AAA/BBB/CCC 등록)"""
+    import database.connection as connection
+    from database.models import Base, Stock
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(connection, "SessionLocal", factory)
+
+    with factory() as db:
+        for ticker in ("AAA", "BBB", "CCC"):
+            db.add(Stock(ticker=ticker, name=f"{ticker} Inc.", exchange="NASDAQ", is_active=True))
+        db.commit()
+
+    yield factory
+    engine.dispose()
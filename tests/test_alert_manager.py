@@ -82,3 +82,385 @@ def test_alert_condition_equality():
     a = _AlertCondition("STOP_LOSS", 100.0)
     b = _AlertCondition("STOP_LOSS", 100.0)
     assert a == b
+
+
+def test_alert_condition_uses_slots():
+    """_AlertCondition은 slots dataclass — 인스턴스 __dict__ 없음"""
+    from notifications.alert_manager import _AlertCondition
+    cond = _AlertCondition("STOP_LOSS", 100.0)
+    assert not hasattr(cond, "__dict__")
+
+
+# ── 알림 조건 캐시 테스트 ─────────────────────────────────────────────────────
+
+def test_get_conditions_uses_cache_within_ttl():
+    """TTL 이내이고 모든 종목이 캐시에 있으면 DB 재조회 없음"""
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+
+    with patch.object(am, "_load_conditions", return_value={1: [], 2: []}) as mock_load:
+        am._get_conditions(MagicMock(), [1, 2])
+        am._get_conditions(MagicMock(), [2])
+
+    mock_load.assert_called_once()
+
+
+def test_get_conditions_reloads_on_new_stock():
+    """캐시에 없는 종목(신규 보유)이 있으면 TTL 이내라도 재적재"""
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+
+    with patch.object(am, "_load_conditions", return_value={1: []}) as mock_load:
+        am._get_conditions(MagicMock(), [1])
+        am._get_conditions(MagicMock(), [1, 3])
+
+    assert mock_load.call_count == 2
+
+
+def test_get_conditions_reloads_when_version_changes():
+    """다른 프로세스의 알림 변경(버전 변화)은 TTL 이내라도 재적재"""
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+    db = MagicMock()
+    db.execute.return_value.one.side_effect = [(1, "t1", 5), (1, "t1", 5), (0, None, 5)]
+
+    with patch.object(am, "_load_conditions", return_value={1: []}) as mock_load:
+        am._get_conditions(db, [1])
+        am._get_conditions(db, [1])   # 버전 동일 → 캐시
+        am._get_conditions(db, [1])   # 알림 삭제로 건수 변화 → 재적재
+
+    assert mock_load.call_count == 2
+
+
+def test_conditions_version_tracks_alert_mutations():
+    """버전 조회는 알림 추가/삭제를 감지 (실제 SQLite에서 실행)"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from database.models import Base, PriceAlert, Stock
+    from notifications.alert_manager import _CONDITIONS_VERSION
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        stock = Stock(ticker="AAA", name="AAA Inc.", exchange="NASDAQ", is_active=True)
+        db.add(stock)
+        db.commit()
+        empty = tuple(db.execute(_CONDITIONS_VERSION).one())
+
+        alert = PriceAlert(stock_id=stock.id, alert_type="STOP_LOSS", threshold_value=90.0)
+        db.add(alert)
+        db.commit()
+        added = tuple(db.execute(_CONDITIONS_VERSION).one())
+
+        db.delete(alert)
+        db.commit()
+        deleted = tuple(db.execute(_CONDITIONS_VERSION).one())
+
+    assert empty != added
+    assert added != deleted
+
+
+def test_set_alert_invalidates_conditions_cache():
+    """set_alert 성공 시 알림 조건 캐시 만료"""
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+    am._conditions_cache_expiry = float("inf")
+
+    mock_db = MagicMock()
+    mock_db.query.return_value.filter.return_value.first.return_value = MagicMock(id=1)
+
+    with patch("notifications.alert_manager.get_db") as mock_get_db:
+        mock_get_db.return_value.__enter__ = lambda s: mock_db
+        mock_get_db.return_value.__exit__ = MagicMock(return_value=False)
+        result = am.set_alert("AAPL", "STOP_LOSS", 150.0)
+
+    assert result is True
+    assert am._conditions_cache_expiry == 0.0
+
+
+# ── 쿨다운 판정 테스트 ────────────────────────────────────────────────────────
+
+def test_is_in_cooldown_uses_type_specific_window():
+    """STOP_LOSS(15분)은 20분 전 발화 시 해제, VOLUME_SURGE(360분)는 유지"""
+    from datetime import timedelta
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+    fired_at = am._now() - timedelta(minutes=20)
+    last_fired = {(1, "STOP_LOSS"): fired_at, (1, "VOLUME_SURGE"): fired_at}
+
+    assert am._is_in_cooldown(last_fired, 1, "STOP_LOSS") is False
+    assert am._is_in_cooldown(last_fired, 1, "VOLUME_SURGE") is True
+    assert am._is_in_cooldown(last_fired, 2, "STOP_LOSS") is False
+
+
+# ── 종목별 최신 행 일괄 조회 테스트 (SQLite) ─────────────────────────────────
+
+def _stock_ids(factory) -> dict[str, int]:
+    from database.models import Stock
+    with factory() as db:
+        return dict(db.query(Stock.ticker, Stock.id).all())
+
+
+def _recommendation(stock_id, date, stop_loss):
+    from database.models import AIRecommendation
+    return AIRecommendation(
+        stock_id=stock_id, recommendation_date=date, action="BUY",
+        confidence=0.8, reasoning="test", stop_loss=stop_loss,
+    )
+
+
+def test_latest_by_stock_picks_newest_row_per_stock(db_session_factory):
+    """종목별로 order_col이 가장 큰 행 1개만 반환, 행이 없는 종목은 키 없음"""
+    from datetime import datetime
+    from database.models import AIRecommendation
+    from notifications.alert_manager import AlertManager
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        db.add_all([
+            _recommendation(ids["AAA"], datetime(2025, 1, 1), 90.0),
+            _recommendation(ids["AAA"], datetime(2025, 1, 3), 93.0),
+            _recommendation(ids["AAA"], datetime(2025, 1, 2), 92.0),
+            _recommendation(ids["BBB"], datetime(2025, 1, 1), 40.0),
+        ])
+        db.commit()
+
+        latest = AlertManager()._latest_by_stock(
+            db, AIRecommendation, AIRecommendation.recommendation_date,
+            AIRecommendation.stock_id.in_(ids.values()),
+        )
+
+    assert set(latest) == {ids["AAA"], ids["BBB"]}
+    assert latest[ids["AAA"]].stop_loss == 93.0
+    assert latest[ids["BBB"]].stop_loss == 40.0
+
+
+def test_latest_by_stock_tie_prefers_last_saved_row(db_session_factory):
+    """order_col 값이 같으면 나중에 저장된(id가 큰) 행을 최신으로 선택"""
+    from datetime import datetime
+    from database.models import AIRecommendation
+    from notifications.alert_manager import AlertManager
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        for stop_loss in (90.0, 95.0, 91.0):
+            db.add(_recommendation(ids["AAA"], datetime(2025, 1, 1), stop_loss))
+            db.flush()
+        db.commit()
+
+        latest = AlertManager()._latest_by_stock(
+            db, AIRecommendation, AIRecommendation.recommendation_date,
+            AIRecommendation.stock_id == ids["AAA"],
+        )
+
+    assert latest[ids["AAA"]].stop_loss == 91.0
+
+
+def test_load_last_fired_returns_latest_per_stock_and_type(db_session_factory):
+    """(종목, 유형)별 마지막 발화 시각만 반환하고 최장 쿨다운 이전 이력은 제외"""
+    from datetime import timedelta
+    from database.models import AlertHistory
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+    ids = _stock_ids(db_session_factory)
+    now = am._now()
+
+    def history(ticker, alert_type, minutes_ago):
+        return AlertHistory(
+            stock_id=ids[ticker], alert_type=alert_type,
+            triggered_at=now - timedelta(minutes=minutes_ago), is_sent=True,
+        )
+
+    with db_session_factory() as db:
+        db.add_all([
+            history("AAA", "STOP_LOSS", 30),
+            history("AAA", "STOP_LOSS", 5),
+            history("AAA", "STOP_LOSS", 5),
+            history("AAA", "TARGET_PRICE", 50),
+            history("BBB", "STOP_LOSS", 10),
+            history("CCC", "STOP_LOSS", 24 * 60),  # 최장 쿨다운(360분) 이전
+        ])
+        db.commit()
+
+        last_fired = am._load_last_fired(db, now)
+
+    assert last_fired == {
+        (ids["AAA"], "STOP_LOSS"): now - timedelta(minutes=5),
+        (ids["AAA"], "TARGET_PRICE"): now - timedelta(minutes=50),
+        (ids["BBB"], "STOP_LOSS"): now - timedelta(minutes=10),
+    }
+
+
+# ── 거래량 급등 체크 테스트 (SQLite) ─────────────────────────────────────────
+
+def test_volume_surge_uses_only_todays_bars(db_session_factory):
+    """어제 일봉의 급등은 무시하고 오늘 일봉이 volume_ma_20 × 배수 이상인 종목만 발화"""
+    from datetime import timedelta
+    from database.models import AlertHistory, PriceHistory, TechnicalIndicator
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+    ids = _stock_ids(db_session_factory)
+    today = am._now().replace(hour=0, minute=0, second=0, microsecond=0)
+    yesterday = today - timedelta(days=1)
+
+    def bar(ticker, ts, volume):
+        return PriceHistory(
+            stock_id=ids[ticker], timestamp=ts, interval="1d",
+            open=10.0, high=11.0, low=9.0, close=10.5, volume=volume,
+        )
+
+    with db_session_factory() as db:
+        db.add_all([
+            bar("AAA", yesterday, 1_000),
+            bar("AAA", today, 5_000),      # 오늘 급등 → 발화
+            bar("BBB", yesterday, 9_000),  # 어제만 급등, 오늘 일봉 없음 → 제외
+            bar("CCC", yesterday, 9_000),
+            bar("CCC", today, 1_000),      # 어제 급등, 오늘은 평범 → 제외
+        ])
+        db.add_all(
+            TechnicalIndicator(stock_id=ids[t], date=yesterday, volume_ma_20=1_000.0)
+            for t in ("AAA", "BBB", "CCC")
+        )
+        db.commit()
+
+    triggered = am.check_volume_surge(threshold=3.0)
+
+    assert [(a["ticker"], a["volume"], a["ratio"]) for a in triggered] == [("AAA", 5_000, 5.0)]
+    with db_session_factory() as db:
+        assert db.query(AlertHistory.stock_id, AlertHistory.alert_type).all() == [
+            (ids["AAA"], "VOLUME_SURGE")
+        ]
+
+
+# ── 보유 종목 알림 체크 테스트 (SQLite) ──────────────────────────────────────
+
+def _add_holding(db, stock_id, current_price, bought_at=None):
+    from datetime import datetime
+    from database.models import PortfolioHolding
+    db.add(PortfolioHolding(
+        stock_id=stock_id, quantity=10, avg_buy_price=100.0, total_invested=1000.0,
+        current_price=current_price, first_bought_at=bought_at or datetime(2025, 1, 1),
+    ))
+
+
+def _add_daily_high(db, stock_id, ts, high):
+    from database.models import PriceHistory
+    db.add(PriceHistory(
+        stock_id=stock_id, timestamp=ts, interval="1d",
+        open=high, high=high, low=high, close=high, volume=1_000,
+    ))
+
+
+def _fired(triggered) -> set[tuple[str, str]]:
+    return {(a["ticker"], a["alert_type"]) for a in triggered}
+
+
+def test_portfolio_alerts_fire_at_price_thresholds(db_session_factory):
+    """STOP_LOSS는 현재가 <= 기준, TARGET_PRICE는 현재가 >= 기준에서 발화 (경계값 포함)"""
+    from database.models import PriceAlert
+    from notifications.alert_manager import AlertManager
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        _add_holding(db, ids["AAA"], 90.0)
+        _add_holding(db, ids["BBB"], 120.0)
+        db.add_all([
+            PriceAlert(stock_id=ids["AAA"], alert_type="STOP_LOSS", threshold_value=90.0),
+            PriceAlert(stock_id=ids["AAA"], alert_type="TARGET_PRICE", threshold_value=90.01),
+            PriceAlert(stock_id=ids["BBB"], alert_type="STOP_LOSS", threshold_value=119.99),
+            PriceAlert(stock_id=ids["BBB"], alert_type="TARGET_PRICE", threshold_value=120.0),
+        ])
+        db.commit()
+
+    triggered = AlertManager().check_portfolio_alerts()
+
+    assert _fired(triggered) == {("AAA", "STOP_LOSS"), ("BBB", "TARGET_PRICE")}
+    with db_session_factory() as db:
+        fired_alerts = {
+            (a.stock_id, a.alert_type)
+            for a in db.query(PriceAlert).filter(PriceAlert.last_triggered_at.isnot(None))
+        }
+    assert fired_alerts == {(ids["AAA"], "STOP_LOSS"), (ids["BBB"], "TARGET_PRICE")}
+
+
+def test_portfolio_alerts_fall_back_to_ai_recommendation(db_session_factory):
+    """PriceAlert가 없으면 최신 AI 추천의 stop_loss로 발화"""
+    from datetime import datetime
+    from notifications.alert_manager import AlertManager
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        _add_holding(db, ids["AAA"], 80.0)
+        db.add(_recommendation(ids["AAA"], datetime(2025, 1, 2), 85.0))
+        db.commit()
+
+    triggered = AlertManager().check_portfolio_alerts()
+
+    assert [(a["ticker"], a["alert_type"], a["threshold"]) for a in triggered] == [
+        ("AAA", "STOP_LOSS", 85.0)
+    ]
+
+
+def test_trailing_stop_fires_at_default_drawdown(db_session_factory):
+    """ATR이 없으면 최고가 대비 -10%에서 발화, 그보다 덜 빠지면 미발화, 일봉 이력 없는 종목은 건너뜀"""
+    from datetime import datetime
+    from notifications.alert_manager import AlertManager
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        _add_holding(db, ids["AAA"], 90.0)
+        _add_holding(db, ids["BBB"], 90.01)
+        _add_holding(db, ids["CCC"], 1.0)  # 일봉 이력 없음
+        for ticker in ("AAA", "BBB"):
+            _add_daily_high(db, ids[ticker], datetime(2025, 1, 2), 100.0)
+        db.commit()
+
+    triggered = AlertManager().check_portfolio_alerts()
+
+    assert _fired(triggered) == {("AAA", "TRAILING_STOP")}
+    assert triggered[0]["high_watermark"] == 100.0
+    assert triggered[0]["drawdown_pct"] == -10.0
+
+
+def test_trailing_stop_uses_atr_and_post_purchase_high(db_session_factory):
+    """ATR 기반 기준(3×ATR/현재가)을 쓰고, 최고가는 매수일 이후 일봉에서만 구함"""
+    from datetime import datetime
+    from database.models import TechnicalIndicator
+    from notifications.alert_manager import AlertManager
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        # AAA: ATR 2 → 기준 6/92 ≈ 6.5% — 8% 하락이면 기본값(10%)과 달리 발화
+        _add_holding(db, ids["AAA"], 92.0)
+        _add_daily_high(db, ids["AAA"], datetime(2025, 1, 2), 100.0)
+        db.add(TechnicalIndicator(stock_id=ids["AAA"], date=datetime(2025, 1, 2), atr_14=2.0))
+        # BBB: 매수(1/10) 전 최고가 200은 무시 → 최고가 100 대비 -5%로 미발화
+        _add_holding(db, ids["BBB"], 95.0, bought_at=datetime(2025, 1, 10))
+        _add_daily_high(db, ids["BBB"], datetime(2025, 1, 5), 200.0)
+        _add_daily_high(db, ids["BBB"], datetime(2025, 1, 11), 100.0)
+        db.commit()
+
+    triggered = AlertManager().check_portfolio_alerts()
+
+    assert _fired(triggered) == {("AAA", "TRAILING_STOP")}
+
+
+def test_portfolio_alert_cooldown_suppresses_repeat(db_session_factory):
+    """쿨다운 이내 두 번째 체크에서는 같은 알림이 다시 발화하지 않고 이력도 1건만 남음"""
+    from database.models import AlertHistory, PriceAlert
+    from notifications.alert_manager import AlertManager
+    am = AlertManager()
+    ids = _stock_ids(db_session_factory)
+
+    with db_session_factory() as db:
+        _add_holding(db, ids["AAA"], 80.0)
+        db.add(PriceAlert(stock_id=ids["AAA"], alert_type="STOP_LOSS", threshold_value=85.0))
+        db.commit()
+
+    first = am.check_portfolio_alerts()
+    second = am.check_portfolio_alerts()
+
+    assert _fired(first) == {("AAA", "STOP_LOSS")}
+    assert second == []
+    with db_session_factory() as db:
+        assert db.query(AlertHistory).count() == 1
@@ -0,0 +1,122 @@
+"""
+notifications/dispatch.py 단위 테스트
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+_SEND_METHODS = ("send_buy_recommendations", "send_sell_signals", "send_price_alerts", "send_daily_summary")
+
+
+def _notifier(digest: bool = False):
+    """send_* 가 True를 반환하는 채널 목 (digest=True면 send_digest도 제공)"""
+    methods = _SEND_METHODS + (("send_digest",) if digest else ())
+    notifier = MagicMock(spec=list(methods))
+    for method in methods:
+        getattr(notifier, method).return_value = True
+    return notifier
+
+
+# ── dispatch 테스트 ───────────────────────────────────────────────────────────
+
+def test_dispatch_nothing_to_send_returns_empty():
+    """전달된 알림이 없으면 어떤 채널도 호출하지 않고 {} 반환"""
+    from notifications import dispatch as module
+    kakao, telegram = _notifier(), _notifier()
+
+    with patch.object(module, "_CHANNELS", [("카카오", kakao), ("텔레그램", telegram)]):
+        assert module.dispatch(recommendations=[], alerts=None) == {}
+
+    assert kakao.method_calls == []
+    assert telegram.method_calls == []
+
+
+def test_dispatch_sends_each_kind_to_every_channel():
+    """다이제스트 미지원 채널에는 알림 종류별 send_* 를 1회씩, 전달받은 인자로 호출"""
+    from notifications import dispatch as module
+    kakao, other = _notifier(), _notifier()
+    recs = [{"ticker": "AAPL", "action": "BUY"}]
+    sells = [{"ticker": "MSFT", "signal": "SELL"}]
+    summary = {"total_holdings": 1, "holdings": []}
+
+    with patch.object(module, "_CHANNELS", [("카카오", kakao), ("기타", other)]):
+        results = module.dispatch(recommendations=recs, sell_signals=sells, daily_summary=summary)
+
+    assert results == {
+        f"{label}.{method}": True
+        for label in ("카카오", "기타")
+        for method in ("send_buy_recommendations", "send_sell_signals", "send_daily_summary")
+    }
+    for notifier in (kakao, other):
+        notifier.send_buy_recommendations.assert_called_once_with(recs)
+        notifier.send_sell_signals.assert_called_once_with(sells)
+        notifier.send_daily_summary.assert_called_once_with(summary)
+        notifier.send_price_alerts.assert_not_called()
+
+
+def test_dispatch_uses_digest_for_multiple_kinds():
+    """2종 이상이면 send_digest 지원 채널은 요약까지 묶어 1건만 전송, 미지원 채널은 개별 전송"""
+    from notifications import dispatch as module
+    kakao, telegram = _notifier(), _notifier(digest=True)
+    recs = [{"ticker": "AAPL", "action": "BUY"}]
+    summary = {"total_holdings": 1, "holdings": []}
+
+    with patch.object(module, "_CHANNELS", [("카카오", kakao), ("텔레그램", telegram)]):
+        results = module.dispatch(recommendations=recs, daily_summary=summary)
+
+    assert results == {
+        "카카오.send_buy_recommendations": True,
+        "카카오.send_daily_summary": True,
+        "텔레그램.send_digest": True,
+    }
+    telegram.send_digest.assert_called_once_with(buys=recs, sells=None, alerts=None, summary=summary)
+    for method in _SEND_METHODS:
+        getattr(telegram, method).assert_not_called()
+
+
+def test_dispatch_single_kind_skips_digest():
+    """1종만 보내면 다이제스트 지원 채널도 기존 send_* 를 그대로 사용"""
+    from notifications import dispatch as module
+    telegram = _notifier(digest=True)
+    alerts = [{"ticker": "AAPL", "alert_type": "STOP_LOSS"}]
+
+    with patch.object(module, "_CHANNELS", [("텔레그램", telegram)]):
+        results = module.dispatch(alerts=alerts)
+
+    assert results == {"텔레그램.send_price_alerts": True}
+    telegram.send_digest.assert_not_called()
+
+
+def test_dispatch_channel_error_is_isolated():
+    """한 채널이 예외/실패를 내도 다른 채널 발송은 계속되고 결과에 False 로 기록"""
+    from notifications import dispatch as module
+    kakao, telegram = _notifier(), _notifier(digest=True)
+    kakao.send_price_alerts.side_effect = RuntimeError("token expired")
+    alerts = [{"ticker": "AAPL", "alert_type": "STOP_LOSS"}]
+
+    with patch.object(module, "_CHANNELS", [("카카오", kakao), ("텔레그램", telegram)]):
+        results = module.dispatch(alerts=alerts)
+
+    assert results == {"카카오.send_price_alerts": False, "텔레그램.send_price_alerts": True}
+    telegram.send_price_alerts.assert_called_once_with(alerts)
+
+
+def test_daily_summary_job_computes_summary_once():
+    """장 마감 작업은 요약을 1회만 계산해 오늘의 매수/매도 신호와 함께 한 번에 dispatch"""
+    pytest.importorskip("apscheduler")
+    from data_fetcher import scheduler
+    summary = {"total_holdings": 2, "holdings": []}
+    buys = [{"ticker": "AAPL", "action": "BUY"}]
+    sells = [{"ticker": "MSFT", "signal": "STRONG_SELL"}]
+
+    with patch.object(scheduler, "_is_nyse_trading_day", return_value=True), \
+            patch.object(scheduler, "_todays_signals", return_value=(buys, sells)), \
+            patch("portfolio.portfolio_manager.portfolio_manager") as mock_pm, \
+            patch("notifications.dispatch.dispatch") as mock_dispatch:
+        mock_pm.get_summary.return_value = summary
+        scheduler.job_daily_portfolio_summary()
+
+    mock_pm.get_summary.assert_called_once_with()
+    mock_dispatch.assert_called_once_with(
+        recommendations=buys, sell_signals=sells, daily_summary=summary,
+    )
@@ -0,0 +1,224 @@
+"""
+kakao.py 토큰 캐시/갱신 단위 테스트
+"""
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def kakao_settings(tmp_path, monkeypatch):
+    """.env 토큰과 캐시 파일 경로를 테스트용 값으로 교체"""
+    from config.settings import settings
+    monkeypatch.setattr(settings, "KAKAO_ACCESS_TOKEN", "env-access")
+    monkeypatch.setattr(settings, "KAKAO_REFRESH_TOKEN", "env-refresh")
+    monkeypatch.setattr(settings, "KAKAO_TOKEN_CACHE", tmp_path / "kakao_token_cache.json")
+    return settings
+
+
+def _write_cache(settings, env_refresh="env-refresh", **payload):
+    """env_refresh: 캐시를 만들 당시의 .env Refresh Token (기본값은 현재 .env 값)"""
+    from notifications.kakao import _token_fingerprint
+    payload.setdefault("env_refresh_sha256", _token_fingerprint(env_refresh))
+    settings.KAKAO_TOKEN_CACHE.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_valid_cache_restores_both_tokens(kakao_settings):
+    """유효한 캐시 → access/refresh 토큰 모두 복원, 만료 전까지 갱신 불필요"""
+    from notifications.kakao import KakaoNotifier
+    _write_cache(
+        kakao_settings,
+        access_token="cached-access",
+        refresh_token="cached-refresh",
+        expires_at=time.time() + 3600,
+    )
+
+    notifier = KakaoNotifier()
+
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "cached-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "cached-refresh"
+    assert notifier._token_expiry is not None
+    assert not notifier._token_expiring()
+
+
+def test_expired_cache_still_restores_refresh_token(kakao_settings):
+    """만료된 캐시 → 회전된 refresh 토큰은 복원하고 첫 전송 전에 갱신하도록 표시"""
+    from notifications.kakao import KakaoNotifier
+    _write_cache(
+        kakao_settings,
+        access_token="cached-access",
+        refresh_token="rotated-refresh",
+        expires_at=time.time() - 10,
+    )
+
+    notifier = KakaoNotifier()
+
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "rotated-refresh"
+    assert notifier._token_expiring()
+
+
+@pytest.mark.parametrize("content", ["{not json", "[]", '{"access_token": "a"}'])
+def test_corrupt_cache_is_ignored(kakao_settings, content):
+    """깨진 캐시 파일 → .env 토큰 유지, 만료 시각 모름"""
+    from notifications.kakao import KakaoNotifier
+    kakao_settings.KAKAO_TOKEN_CACHE.write_text(content, encoding="utf-8")
+
+    notifier = KakaoNotifier()
+
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "env-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "env-refresh"
+    assert notifier._token_expiry is None
+
+
+def test_missing_cache_keeps_env_tokens(kakao_settings):
+    """캐시 파일 없음 → .env 토큰 그대로 사용"""
+    from notifications.kakao import KakaoNotifier
+
+    notifier = KakaoNotifier()
+
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "env-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "env-refresh"
+    assert notifier._token_expiry is None
+
+
+
+def test_cache_from_previous_env_tokens_is_ignored(kakao_settings):
+    """.env 토큰을 재발급한 뒤에는 이전 .env 토큰에서 파생된 캐시를 무시"""
+    from notifications.kakao import KakaoNotifier
+    _write_cache(
+        kakao_settings,
+        env_refresh="old-env-refresh",
+        access_token="cached-access",
+        refresh_token="cached-refresh",
+        expires_at=time.time() + 3600,
+    )
+
+    notifier = KakaoNotifier()
+
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "env-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "env-refresh"
+    assert notifier._token_expiry is None
+
+
+def test_cache_without_env_marker_is_ignored(kakao_settings):
+    """어느 .env 토큰에서 만들었는지 기록이 없는 캐시 → .env 토큰 사용"""
+    from notifications.kakao import KakaoNotifier
+    kakao_settings.KAKAO_TOKEN_CACHE.write_text(json.dumps({
+        "access_token": "cached-access",
+        "refresh_token": "cached-refresh",
+        "expires_at": time.time() + 3600,
+    }), encoding="utf-8")
+
+    KakaoNotifier()
+
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "env-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "env-refresh"
+
+
+def test_refreshed_tokens_survive_restart(kakao_settings, monkeypatch):
+    """갱신 후 저장한 캐시는 .env가 그대로인 다음 프로세스에서 복원됨 (회전된 Refresh Token 포함)"""
+    from notifications.kakao import KakaoNotifier
+    monkeypatch.setattr(kakao_settings, "KAKAO_REST_API_KEY", "rest-key")
+    resp = MagicMock()
+    resp.json.return_value = {
+        "access_token": "new-access",
+        "refresh_token": "rotated-refresh",
+        "expires_in": 21599,
+    }
+    with patch("notifications.kakao.HTTP_CLIENT") as client:
+        client.post.return_value = resp
+        assert KakaoNotifier()._refresh_access_token() is True
+
+    # 재시작: settings는 다시 .env 값에서 시작
+    monkeypatch.setattr(kakao_settings, "KAKAO_ACCESS_TOKEN", "env-access")
+    monkeypatch.setattr(kakao_settings, "KAKAO_REFRESH_TOKEN", "env-refresh")
+    notifier = KakaoNotifier()
+
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "new-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "rotated-refresh"
+    assert not notifier._token_expiring()
+
+# ── 동시 토큰 갱신 테스트 ─────────────────────────────────────────────────────
+
+class _FakeKakaoAPI:
+    """토큰 갱신/메시지 전송 엔드포인트 흉내 — 갱신 호출 수를 세고, 현재 토큰만 유효"""
+
+    def __init__(self):
+        self.refresh_calls = 0
+        self.valid_token = "new-access"
+        self.lock = threading.Lock()
+
+    def post(self, url, headers=None, data=None, timeout=None):
+        from notifications.kakao import KAKAO_TOKEN_URL
+        resp = MagicMock()
+        if url == KAKAO_TOKEN_URL:
+            with self.lock:
+                self.refresh_calls += 1
+            time.sleep(0.05)  # 갱신 중 다른 스레드가 끼어들 시간
+            resp.json.return_value = {
+                "access_token": self.valid_token,
+                "refresh_token": "rotated-refresh",
+                "expires_in": 21599,
+            }
+            return resp
+        if headers["Authorization"] == f"Bearer {self.valid_token}":
+            resp.status_code = 200
+            resp.json.return_value = {"result_code": 0}
+        else:
+            resp.status_code = 401
+        return resp
+
+
+def _send_concurrently(notifier, n=5):
+    results = []
+    barrier = threading.Barrier(n)
+
+    def worker():
+        barrier.wait()
+        results.append(notifier._send_message({"object_type": "text", "text": "hi"}))
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_sends_refresh_expiring_token_once(kakao_settings, monkeypatch):
+    """만료 임박 토큰으로 동시 전송 → 사전 갱신은 1회만, 모든 전송 성공"""
+    from notifications.kakao import KakaoNotifier
+    monkeypatch.setattr(kakao_settings, "KAKAO_REST_API_KEY", "rest-key")
+    _write_cache(
+        kakao_settings,
+        access_token="old-access",
+        refresh_token="env-refresh",
+        expires_at=time.time() - 10,
+    )
+    notifier = KakaoNotifier()
+    api = _FakeKakaoAPI()
+
+    with patch("notifications.kakao.HTTP_CLIENT", api):
+        results = _send_concurrently(notifier)
+
+    assert results == [True] * 5
+    assert api.refresh_calls == 1
+    assert kakao_settings.KAKAO_ACCESS_TOKEN == "new-access"
+    assert kakao_settings.KAKAO_REFRESH_TOKEN == "rotated-refresh"
+
+
+def test_concurrent_401s_refresh_once(kakao_settings, monkeypatch):
+    """만료 시각을 모르는 토큰이 동시에 401 → 갱신은 1회만, 나머지는 새 토큰으로 재시도"""
+    from notifications.kakao import KakaoNotifier
+    monkeypatch.setattr(kakao_settings, "KAKAO_REST_API_KEY", "rest-key")
+    notifier = KakaoNotifier()
+    api = _FakeKakaoAPI()
+
+    with patch("notifications.kakao.HTTP_CLIENT", api):
+        results = _send_concurrently(notifier)
+
+    assert results == [True] * 5
+    assert api.refresh_calls == 1
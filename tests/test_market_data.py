@@ -0,0 +1,59 @@
+"""
+market_data.py 일괄 현재가 캐시(stale-while-revalidate) 단위 테스트
+"""
+import time
+from unittest.mock import MagicMock, patch
+
+
+def _fetcher_with_cached(age: float, price: float = 100.0):
+    """AAA 시세가 age초 전에 캐시된 MarketDataFetcher (백그라운드 갱신 executor는 mock)"""
+    from data_fetcher.market_data import MarketDataFetcher
+    fetcher = MarketDataFetcher()
+    fetcher._quote_executor = MagicMock()
+    fetcher._quote_cache["AAA"] = (time.monotonic() - age, {"ticker": "AAA", "price": price})
+    return fetcher
+
+
+def test_fresh_quote_served_from_cache():
+    """TTL 이내 시세는 다운로드/갱신 없이 그대로 반환, stale 표시 없음"""
+    fetcher = _fetcher_with_cached(age=1)
+
+    with patch.object(fetcher, "_download_quotes") as mock_download:
+        result = fetcher.fetch_realtime_prices(["AAA"])
+
+    assert result["AAA"]["price"] == 100.0
+    assert "stale" not in result["AAA"]
+    mock_download.assert_not_called()
+    fetcher._quote_executor.submit.assert_not_called()
+
+
+def test_stale_quote_marked_and_refreshed_in_background():
+    """TTL~STALE_TTL 사이 시세는 stale=True로 즉시 반환하고 백그라운드 갱신 1회 제출"""
+    from data_fetcher.market_data import QUOTE_CACHE_TTL
+    fetcher = _fetcher_with_cached(age=QUOTE_CACHE_TTL + 1)
+
+    with patch.object(fetcher, "_download_quotes") as mock_download:
+        first = fetcher.fetch_realtime_prices(["AAA"])
+        second = fetcher.fetch_realtime_prices(["AAA"])
+
+    assert first["AAA"] == {"ticker": "AAA", "price": 100.0, "stale": True}
+    assert second["AAA"]["stale"] is True
+    mock_download.assert_not_called()
+    # 갱신 진행 중인 종목은 중복 제출하지 않음
+    fetcher._quote_executor.submit.assert_called_once_with(fetcher._refresh_quotes, ["AAA"])
+    # 캐시 원본에는 stale 표시가 섞이지 않음
+    assert "stale" not in fetcher._quote_cache["AAA"][1]
+
+
+def test_expired_quote_downloaded_synchronously():
+    """STALE_TTL을 넘긴 시세는 동기 다운로드 결과를 반환"""
+    from data_fetcher.market_data import QUOTE_STALE_TTL
+    fetcher = _fetcher_with_cached(age=QUOTE_STALE_TTL + 1)
+    fresh = {"ticker": "AAA", "price": 120.0}
+
+    with patch.object(fetcher, "_download_quotes", return_value={"AAA": fresh}) as mock_download:
+        result = fetcher.fetch_realtime_prices(["AAA"])
+
+    assert result["AAA"] == fresh
+    mock_download.assert_called_once_with(["AAA"])
+    fetcher._quote_executor.submit.assert_not_called()
@@ -0,0 +1,259 @@
+"""
+portfolio_manager.py 단위 테스트
+임시 SQLite 파일 DB(conftest.db_session_factory)에 바인딩한 세션으로 실제 SQL을 실행합니다.
+"""
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+
+
+@pytest.fixture
+def pm(db_session_factory):
+    """종목 id 캐시가 비어 있는 새 PortfolioManager"""
+    from portfolio.portfolio_manager import PortfolioManager
+    return PortfolioManager()
+
+
+def _holding(factory, ticker):
+    from database.models import PortfolioHolding, Stock
+    with factory() as db:
+        return (
+            db.query(PortfolioHolding)
+            .join(Stock, PortfolioHolding.stock_id == Stock.id)
+            .filter(Stock.ticker == ticker)
+            .first()
+        )
+
+
+# ── 동시 매수 테스트 ──────────────────────────────────────────────────────────
+
+def test_concurrent_buys_do_not_lose_updates(pm, db_session_factory, monkeypatch):
+    """같은 종목 동시 매수 시 모든 수량/투자금이 누적됨 (lost update 없음)"""
+    import portfolio.portfolio_manager as module
+    from database.models import Transaction
+
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+
+    # 보유 현황 조회와 기록 사이를 넓혀 경합을 재현 가능하게 만듦
+    def slow_transaction(**kwargs):
+        time.sleep(0.05)
+        return Transaction(**kwargs)
+
+    monkeypatch.setattr(module, "Transaction", slow_transaction)
+
+    errors = []
+    barrier = threading.Barrier(3)
+
+    def worker():
+        try:
+            barrier.wait()
+            pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 2))
+        except Exception as e:  # pragma: no cover - 실패 시 원인 표시용
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    holding = _holding(db_session_factory, "AAA")
+    assert holding.quantity == 40.0
+    assert holding.total_invested == 4000.0
+    assert holding.avg_buy_price == 100.0
+
+
+def test_new_ticker_registered_outside_write_lock(pm, db_session_factory):
+    """미등록 종목의 정보 조회(네트워크) 중에는 DB 쓰기 잠금을 잡고 있지 않음"""
+    from sqlalchemy import text
+    from database.models import Stock
+
+    other = create_engine(db_session_factory.kw["bind"].url, connect_args={"timeout": 0.1})
+
+    def fake_sync(ticker, db):
+        # 다른 연결의 쓰기가 대기 없이 성공해야 함 (잠금 보유 시 database is locked)
+        with other.begin() as conn:
+            conn.execute(text("UPDATE stocks SET is_active = 1 WHERE ticker = 'BBB'"))
+        stock = Stock(ticker=ticker, name=f"{ticker} Corp.", exchange="NYSE", is_active=True)
+        db.add(stock)
+        db.flush()
+        return stock
+
+    try:
+        with patch("portfolio.portfolio_manager.market_fetcher") as mock_fetcher:
+            mock_fetcher.sync_stock_info.side_effect = fake_sync
+            pm.buy("NEW", 1, 10.0, executed_at=datetime(2025, 1, 1))
+            pm.buy_many([{"ticker": "NEW2", "quantity": 1, "price": 10.0}])
+    finally:
+        other.dispose()
+
+    assert mock_fetcher.sync_stock_info.call_count == 2
+    assert _holding(db_session_factory, "NEW").quantity == 1
+    assert _holding(db_session_factory, "NEW2").quantity == 1
+
+# ── 평가값 writeback 테스트 ──────────────────────────────────────────────────
+
+def test_get_holdings_writes_valuation_immediately(pm, db_session_factory):
+    """get_holdings가 계산한 현재가/평가손익은 호출이 끝나면 바로 DB에 반영됨"""
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+
+    with patch("portfolio.portfolio_manager.market_fetcher") as mock_fetcher:
+        mock_fetcher.fetch_realtime_prices.return_value = {"AAA": {"price": 110.0}}
+        holdings = pm.get_holdings(update_prices=True)
+
+    assert holdings[0]["current_price"] == 110.0
+    holding = _holding(db_session_factory, "AAA")
+    assert holding.current_price == 110.0
+    assert holding.unrealized_pnl == pytest.approx(100.0)
+    assert holding.unrealized_pnl_pct == pytest.approx(10.0)
+
+
+def test_valuation_writeback_is_rate_limited_per_holding(pm, db_session_factory, monkeypatch):
+    """기록 간격 이내 반복 조회는 DB에 다시 쓰지 않고, 거래 후나 간격 경과 후에는 즉시 기록"""
+    import portfolio.portfolio_manager as module
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+
+    def poll(price):
+        with patch("portfolio.portfolio_manager.market_fetcher") as mock_fetcher:
+            mock_fetcher.fetch_realtime_prices.return_value = {"AAA": {"price": price}}
+            return pm.get_holdings(update_prices=True)
+
+    pm.get_holdings(update_prices=False)  # 손익만 기록 — 다음 실시세 기록을 막지 않아야 함
+    poll(110.0)
+    holdings = poll(120.0)
+    assert holdings[0]["current_price"] == 120.0  # 화면에는 최신 가격
+    assert _holding(db_session_factory, "AAA").current_price == 110.0  # DB 쓰기는 생략
+
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 2))
+    poll(121.0)
+    holding = _holding(db_session_factory, "AAA")
+    assert holding.current_price == 121.0  # 수량이 바뀌어 즉시 기록
+    assert holding.unrealized_pnl == pytest.approx(420.0)
+
+    monkeypatch.setattr(module, "VALUATION_WRITE_INTERVAL", 0)
+    poll(130.0)
+    assert _holding(db_session_factory, "AAA").current_price == 130.0
+
+def test_write_valuations_skips_deleted_holding(pm, db_session_factory):
+    """삭제된 보유 종목 id가 섞여 있어도 나머지 평가값은 기록됨"""
+    from portfolio.portfolio_manager import _write_valuations
+
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+    holding = _holding(db_session_factory, "AAA")
+
+    with db_session_factory() as db:
+        _write_valuations(db, [
+            {"id": 9999, "current_price": 1.0},
+            {"id": holding.id, "current_price": 111.0},
+            {"id": holding.id, "unrealized_pnl": 5.0, "unrealized_pnl_pct": 0.5},
+        ])
+        db.commit()
+
+    holding = _holding(db_session_factory, "AAA")
+    assert holding.current_price == 111.0
+    assert holding.unrealized_pnl == 5.0
+
+
+def test_stale_quote_shown_but_not_written(pm, db_session_factory):
+    """stale 시세는 결과에 stale=True로 표시되고 DB 현재가/평가손익은 갱신하지 않음"""
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+    before = _holding(db_session_factory, "AAA")
+
+    with patch("portfolio.portfolio_manager.market_fetcher") as mock_fetcher:
+        mock_fetcher.fetch_realtime_prices.return_value = {
+            "AAA": {"price": 90.0, "stale": True},
+        }
+        snapshot = pm.get_dashboard_snapshot()
+
+    holding = snapshot["summary"]["holdings"][0]
+    assert holding["current_price"] == 90.0
+    assert holding["stale"] is True
+    assert snapshot["summary"]["stale_tickers"] == ["AAA"]
+
+    after = _holding(db_session_factory, "AAA")
+    assert after.current_price == before.current_price
+    assert after.unrealized_pnl == before.unrealized_pnl
+
+
+# ── 일괄 매수(buy_many) 테스트 ───────────────────────────────────────────────
+
+def test_buy_many_matches_sequential_buys(pm, db_session_factory):
+    """신규/기존 보유 종목과 중복 티커가 섞여도 buy()를 순서대로 호출한 결과와 같음"""
+    from database.models import Transaction
+
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+
+    count = pm.buy_many([
+        {"ticker": "AAA", "quantity": 10, "price": 120.0, "executed_at": datetime(2025, 1, 2)},
+        {"ticker": "BBB", "quantity": 5, "price": 50.0, "fee": 1.0, "executed_at": datetime(2025, 1, 2)},
+        {"ticker": "BBB", "quantity": 5, "price": 70.0, "fee": 1.0, "executed_at": datetime(2025, 1, 3)},
+    ])
+
+    assert count == 3
+    aaa = _holding(db_session_factory, "AAA")
+    assert aaa.quantity == 20
+    assert aaa.total_invested == pytest.approx(2200.0)
+    assert aaa.avg_buy_price == pytest.approx(110.0)
+
+    bbb = _holding(db_session_factory, "BBB")
+    assert bbb.quantity == 10
+    assert bbb.total_invested == pytest.approx(602.0)
+    assert bbb.avg_buy_price == pytest.approx(60.2)
+    assert bbb.first_bought_at == datetime(2025, 1, 2)
+
+    with db_session_factory() as db:
+        assert db.query(Transaction).count() == 4
+
+
+def test_buy_many_unknown_ticker_rolls_back(pm, db_session_factory):
+    """등록할 수 없는 종목이 하나라도 있으면 ValueError, 거래/보유 현황 모두 기록되지 않음"""
+    from database.models import PortfolioHolding, Transaction
+
+    with patch("portfolio.portfolio_manager.market_fetcher") as mock_fetcher:
+        mock_fetcher.sync_stock_info.return_value = None
+        with pytest.raises(ValueError, match="ZZZZ"):
+            pm.buy_many([
+                {"ticker": "AAA", "quantity": 10, "price": 100.0},
+                {"ticker": "ZZZZ", "quantity": 1, "price": 10.0},
+            ])
+
+    with db_session_factory() as db:
+        assert db.query(Transaction).count() == 0
+        assert db.query(PortfolioHolding).count() == 0
+
+
+# ── 보유 종목 삭제 테스트 ─────────────────────────────────────────────────────
+
+def test_delete_holding_logs_stock_name(pm, db_session_factory):
+    """삭제 로그에 티커와 종목명이 함께 남고 보유 현황은 제거됨"""
+    pm.buy("AAA", 10, 100.0, executed_at=datetime(2025, 1, 1))
+
+    with patch("portfolio.portfolio_manager.logger") as mock_logger:
+        assert pm.delete_holding("AAA") is True
+
+    message = mock_logger.success.call_args.args[0]
+    assert "AAA (AAA Inc.)" in message
+    assert _holding(db_session_factory, "AAA") is None
+
+
+# ── 월별 실현손익 테스트 ─────────────────────────────────────────────────────
+
+def test_realized_pnl_by_period_groups_by_month(pm, db_session_factory):
+    """SQLite에서 SELL 실현손익을 월 순서대로 합산"""
+    pm.buy("AAA", 30, 100.0, executed_at=datetime(2025, 1, 1))
+    pm.sell("AAA", 10, 110.0, executed_at=datetime(2025, 2, 3))
+    pm.sell("AAA", 10, 90.0, executed_at=datetime(2025, 2, 20))
+    pm.sell("AAA", 5, 120.0, executed_at=datetime(2025, 3, 1))
+
+    result = pm.get_realized_pnl_by_period()
+
+    assert [m["month"] for m in result["monthly"]] == ["2025-02", "2025-03"]
+    assert result["monthly"][0]["trade_count"] == 2
+    assert result["monthly"][0]["realized_pnl"] == pytest.approx(0.0)
+    assert result["monthly"][1]["realized_pnl"] == pytest.approx(100.0)
+    assert result["total_realized"] == pytest.approx(100.0)
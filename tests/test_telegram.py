@@ -0,0 +1,123 @@
+"""
+telegram.py 재시도(backoff/jitter) 및 다이제스트 단위 테스트
+"""
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def telegram_settings(monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", "test-token")
+    monkeypatch.setattr(settings, "TELEGRAM_CHAT_ID", "12345")
+    return settings
+
+
+def _response(status_code, payload):
+    resp = MagicMock(status_code=status_code, text=str(payload))
+    resp.json.return_value = payload
+    return resp
+
+
+_OK = (200, {"ok": True})
+_RATE_LIMITED = (429, {"ok": False, "parameters": {"retry_after": 3}})
+
+
+def _send(*responses, jitter=0.25):
+    """HTTP_CLIENT.post 응답 순서를 지정하고 _send_message 결과와 sleep 호출 인자를 반환"""
+    from notifications.telegram import TelegramNotifier
+    side_effect = [r if isinstance(r, Exception) else _response(*r) for r in responses]
+    with patch("notifications.telegram.HTTP_CLIENT") as client, \
+            patch("notifications.telegram.time.sleep") as sleep, \
+            patch("notifications.telegram.random.uniform", return_value=jitter) as uniform:
+        client.post.side_effect = side_effect
+        result = TelegramNotifier()._send_message("hello")
+    return result, [c.args[0] for c in sleep.call_args_list], client.post.call_count, uniform
+
+
+def test_send_message_success_no_sleep(telegram_settings):
+    """첫 요청이 성공하면 대기 없이 True"""
+    result, sleeps, posts, _ = _send(_OK)
+    assert result is True
+    assert sleeps == []
+    assert posts == 1
+
+
+def test_rate_limit_waits_retry_after_plus_jitter(telegram_settings):
+    """429 → retry_after + 지터(0~0.5초)만큼 대기 후 재시도"""
+    result, sleeps, posts, uniform = _send(_RATE_LIMITED, _OK)
+    assert result is True
+    assert sleeps == [pytest.approx(3.25)]
+    assert posts == 2
+    uniform.assert_called_with(0, 0.5)
+
+
+def test_rate_limit_gives_up_past_max_backoff(telegram_settings):
+    """retry_after가 대기 총합 상한(MAX_BACKOFF_SECONDS)을 넘기면 대기하지 않고 포기"""
+    from notifications.telegram import MAX_BACKOFF_SECONDS
+    too_long = (429, {"ok": False, "parameters": {"retry_after": MAX_BACKOFF_SECONDS}})
+
+    result, sleeps, posts, _ = _send(too_long)
+
+    assert result is False
+    assert sleeps == []
+    assert posts == 1
+
+
+def test_network_error_backoff_capped_by_remaining_budget(telegram_settings):
+    """네트워크 오류 재시도 대기는 남은 대기 예산을 넘지 않으며 총합이 상한 이내"""
+    from notifications.telegram import MAX_BACKOFF_SECONDS
+    almost_all = (429, {"ok": False, "parameters": {"retry_after": MAX_BACKOFF_SECONDS - 1}})
+
+    result, sleeps, posts, _ = _send(almost_all, httpx.ConnectError("boom"), _OK)
+
+    assert result is True
+    assert posts == 3
+    assert sleeps[1] == pytest.approx(MAX_BACKOFF_SECONDS - sleeps[0])
+    assert sum(sleeps) <= MAX_BACKOFF_SECONDS
+
+
+def test_network_error_exhausts_attempts(telegram_settings):
+    """네트워크 오류가 3회 연속되면 False (대기는 재시도 사이 2회)"""
+    error = httpx.ConnectError("boom")
+    result, sleeps, posts, _ = _send(error, error, error)
+    assert result is False
+    assert posts == 3
+    assert sleeps == [pytest.approx(2.25), pytest.approx(2.25)]
+
+
+# ── 다이제스트 테스트 ─────────────────────────────────────────────────────────
+
+def test_send_digest_sends_one_message_with_sections(telegram_settings):
+    """매수/매도/요약 섹션을 메시지 1건으로 전송하고, 비활성 신호는 섹션에서 제외"""
+    from notifications.telegram import TelegramNotifier
+    notifier = TelegramNotifier()
+    buys = [
+        {"ticker": "AAPL", "action": "BUY", "confidence": 0.8, "price_at_recommendation": 190.0},
+        {"ticker": "HOLDX", "action": "HOLD", "confidence": 0.5},
+    ]
+    sells = [{"ticker": "MSFT", "signal": "SELL", "urgency": "HIGH", "current_pnl_pct": -3.0, "reasoning": "r"}]
+    summary = {"total_holdings": 1, "total_unrealized_pnl": 10.0, "total_unrealized_pnl_pct": 1.0,
+               "holdings": [{"ticker": "AAPL", "unrealized_pnl_pct": 1.0}]}
+
+    with patch.object(notifier, "_send_message", return_value=True) as send:
+        assert notifier.send_digest(buys=buys, sells=sells, summary=summary) is True
+
+    send.assert_called_once()
+    text = send.call_args.args[0]
+    assert "*AI 매수 추천 (1개)*" in text
+    assert "*AI 매도 신호 (1개)*" in text
+    assert "오늘의 포트폴리오 요약" in text
+    assert "HOLDX" not in text
+
+
+def test_send_digest_nothing_active_sends_nothing(telegram_settings):
+    """보낼 섹션이 없으면 요청 없이 True"""
+    from notifications.telegram import TelegramNotifier
+    notifier = TelegramNotifier()
+
+    with patch.object(notifier, "_send_message") as send:
+        assert notifier.send_digest(buys=[{"ticker": "X", "action": "HOLD"}], alerts=[]) is True
+
+    send.assert_not_called()